@@ -0,0 +1,596 @@
+# Written By : Jonathan O. Tellechea
+# Adviser    : Mike Hance, Phd
+# Research   : Using a neural network to maximize the significance of tttHH production.
+# Description: Columnar version of rootTreeFlatten.py. Reads the jagged lepton/jet branches as arrays and
+#              computes every flat branch with whole-array operations instead of a PyROOT event loop.
+###########################################################################################################################
+# Imported packages.
+import os, time, argparse
+import tempfile
+import shutil
+import multiprocessing
+import itertools
+import functools
+import numpy as np
+
+seed = 42
+
+# Tree name inside ROOT File.
+treename = "OutputTree"
+
+# Number of leptons and jets that are stored as flat branches.
+maxlepton = 3
+maxjets = 21
+
+# Higgs mass hypothesis [MeV] and number of b-tagged jets used for the chisquare.
+higgsMass = 120000
+chiBjets = 6
+
+# b-tagging working points: tagging efficiency for b-jets, c-jets and light-jets.
+# '0.70' are the rates rootTreeFlatten.py uses, '0.77' and '0.85' follow the c/light rejections
+# of the ATLAS MV2c10 working points.
+workingPoints = {
+    "0.70": (0.70, 0.20, 0.002),
+    "0.77": (0.77, 1 / 6.0, 1 / 134.0),
+    "0.85": (0.85, 1 / 3.1, 1 / 33.0),
+}
+defaultWorkingPoint = "0.70"
+
+# Compression codecs of each output format, the first one is the default.
+compressionCodecs = {
+    "root": ["zlib", "lz4", "lzma"],
+    "parquet": ["zstd", "snappy", "gzip", "brotli", "lz4", "none"],
+    "feather": ["lz4", "zstd"],
+}
+
+# Label to identify data sample.
+truthLabels = {"TTHH.root": 0, "TTBB.root": 1, "TTH.root": 2, "TTZ.root": 3}
+
+# Branches read from the input tree.
+inputBranches = [
+    "nlep",
+    "njet",
+    "mcweight",
+    "met",
+    "met_phi",
+    "leppT",
+    "lepeta",
+    "lepphi",
+    "lepflav",
+    "jetpT",
+    "jeteta",
+    "jetphi",
+    "jetbhadron",
+    "jetchadron",
+]
+
+
+def outputBranches():
+    """
+    Names of the flat branches in the same order rootTreeFlatten.py adds them.
+    """
+    names = []
+    for i in range(1, maxlepton + 1):
+        names += ["lepton%dpT" % i, "lepton%deta" % i, "lepton%dphi" % i]
+        names += ["lepton%dflav" % i, "mt%d" % i, "dr%d" % i]
+    for i in range(1, maxjets + 1):
+        names += ["jet%dpT" % i, "jet%deta" % i, "jet%dphi" % i, "jet%dbtag" % i]
+    names += ["numlep", "truth", "numjet", "weights", "btag", "cent", "srap"]
+    names += ["m_bb", "h_b", "chi", "met", "metPhi"]
+    return names
+
+
+def btagBranches():
+    """
+    Names of the flat branches that depend on the b-tagging working point.
+    """
+    return ["jet%dbtag" % i for i in range(1, maxjets + 1)] + ["btag", "m_bb", "h_b", "srap", "chi"]
+
+
+def pointSuffix(point):
+    """
+    Suffix of the b-tag dependent branches of a working point when several are stored together, e.g. btag_wp0p77.
+    """
+    return "_wp" + point.replace(".", "p")
+
+
+def padJagged(jagged, width=None, fill=0):
+    """
+    Turns a jagged array into a 2D numpy array of shape (events, width).
+
+    Entries past the end of an event are set to fill, events longer than width are clipped.
+    """
+    counts = np.asarray(jagged.counts)
+    content = np.asarray(jagged.flatten(), dtype=np.float64)
+    longest = int(counts.max()) if len(counts) > 0 else 0
+    if width is None:
+        width = longest
+    padded = np.full((len(counts), max(width, longest)), fill, dtype=np.float64)
+    padded[np.arange(padded.shape[1]) < counts[:, None]] = content
+    return padded[:, :width]
+
+
+def firstValue(array):
+    """
+    Per event value of branches stored with one entry per event (event.nlep[0] in PyROOT).
+    """
+    if hasattr(array, "counts"):
+        return padJagged(array, 1)[:, 0]
+    array = np.asarray(array, dtype=np.float64)
+    return array.reshape(len(array), -1)[:, 0]
+
+
+def deltaPhi(phi1, phi2):
+    """
+    Difference in phi wrapped into [-pi, pi), same as TLorentzVector.DeltaPhi.
+    """
+    return np.mod(phi2 - phi1 + np.pi, 2 * np.pi) - np.pi
+
+
+def invariantMass(E, px, py, pz):
+    """
+    Same sign convention as TLorentzVector.M() for negative mass squared.
+    """
+    m2 = E ** 2 - px ** 2 - py ** 2 - pz ** 2
+    return np.where(m2 < 0, -np.sqrt(np.abs(m2)), np.sqrt(np.abs(m2)))
+
+
+def pairMass(jets, a, b):
+    """
+    Invariant mass of the jet pairs (a[n], b[n]), jets is the list [E, px, py, pz].
+    """
+    return invariantMass(*(v[:, a] + v[:, b] for v in jets))
+
+
+@functools.lru_cache()
+def pairingTable(nbjets):
+    """
+    Table of the (o,j,k,l) b-jet pairings used for the chisquare, the Higgs candidates are (o,j) and (k,l).
+
+    Same pairings the nested loops in rootTreeFlatten.py keep, o < j < k < l.
+    Returned as indices into the list of pairs from np.triu_indices(nbjets, 1).
+    """
+    pairIndex = {pair: n for n, pair in enumerate(zip(*np.triu_indices(nbjets, 1)))}
+    table = [
+        (pairIndex[(o, j)], pairIndex[(k, l)])
+        for o, j, k, l in itertools.combinations(range(nbjets), 4)
+    ]
+    return np.array(table).T
+
+
+def minChiSquare(bjets, btag, mass=higgsMass, nbjets=chiBjets):
+    """
+    Minimum chisquare of the two Higgs candidates for all events at once.
+
+    bjets: list [E, px, py, pz] of b-tagged jets, shape (events, >= nbjets), in the order they were tagged.
+    btag: number of b-tagged jets per event, only events with btag >= nbjets get a chisquare.
+    mass: Higgs mass hypothesis [MeV].
+    nbjets: number of leading b-tagged jets considered (4, 6 or 8).
+
+    Returns the chisquare for each event, -999 when there are not enough b-tagged jets.
+    """
+    chi = np.full(len(btag), -999.0)
+    selected = btag >= nbjets
+    if not selected.any():
+        return chi
+    first, second = pairingTable(nbjets)
+    i, j = np.triu_indices(nbjets, 1)
+    pairM = pairMass([v[selected, :nbjets] for v in bjets], i, j)
+    chisq = (pairM[:, first] - mass) ** 2 + (pairM[:, second] - mass) ** 2
+    chi[selected] = chisq.min(axis=1)
+    return chi
+
+
+def tagJets(bhadron, chadron, draws, efficiencies):
+    """
+    Emulated b-tagging of every jet for one working point.
+
+    draws: one uniform random number per jet.
+    efficiencies: (b-jets, c-jets, light-jets) tagging efficiencies.
+    """
+    effB, effC, effLight = efficiencies
+    efficiency = np.where(bhadron == 1, effB, np.where(chadron == 1, effC, effLight))
+    return draws <= efficiency
+
+
+def emulateBtagging(bhadron, chadron, valid, rng, points):
+    """
+    b-tagging emulation for several working points in one pass.
+
+    One random number is drawn per jet from the generator rng and shared by all working points, so a
+    jet tagged at a tight working point is also tagged at a looser one.
+
+    points: dict of name -> (b-jets, c-jets, light-jets) efficiencies.
+
+    Returns a dict of name -> boolean array of tagged jets.
+    """
+    draws = np.ones(valid.shape)
+    draws[valid] = rng.random(np.count_nonzero(valid))
+    return {
+        name: tagJets(bhadron, chadron, draws, efficiencies) & valid
+        for name, efficiencies in points.items()
+    }
+
+
+def btagColumns(tagged, jetpT, jeteta, jets, valid, mass=higgsMass, nbjets=chiBjets):
+    """
+    Branches that depend on the b-tagging: btag, m_bb, h_b, srap, chi and jet%dbtag.
+
+    tagged: boolean array of b-tagged jets, shape (events, jets).
+    jets: list [E, px, py, pz] of all jets, valid marks the jets that exist.
+    """
+    columns = {}
+    nevents = len(tagged)
+
+    # Jet b-tag.
+    values = np.where(valid, tagged, -9)
+    for n in range(1, maxjets + 1):
+        columns["jet%dbtag" % n] = values[:, n - 1]
+
+    # Number of b-tagged jets.
+    btag = tagged.sum(axis=1)
+    columns["btag"] = btag
+
+    # b-tagged jets moved to the front of each event, keeping their order.
+    order = np.argsort(~tagged, axis=1, kind="stable")[:, : max(btag.max(initial=0), nbjets)]
+    bvalid = np.take_along_axis(tagged, order, axis=1)
+    bjets = [np.take_along_axis(v, order, axis=1) for v in jets]
+    beta = np.take_along_axis(jeteta, order, axis=1)
+
+    # All b-tagged jet pairs.
+    i, j = np.triu_indices(order.shape[1], 1)
+    pairValid = bvalid[:, i] & bvalid[:, j]
+    pairPt = np.hypot(bjets[1][:, i] + bjets[1][:, j], bjets[2][:, i] + bjets[2][:, j])
+    pairM = pairMass(bjets, i, j)
+
+    # Mass of the b-tagged pair with the largest vector sum of Pt, scaled to GeV.
+    best = np.where(pairValid, pairPt, -np.inf).argmax(axis=1)
+    bestM = np.take_along_axis(pairM, best[:, None], axis=1)[:, 0]
+    columns["m_bb"] = np.where(pairValid.any(axis=1), bestM, 0) / 1000
+
+    # Sum of Pt for all b-tag jets, scaled to GeV.
+    columns["h_b"] = np.where(tagged, jetpT, 0).sum(axis=1) / 1000
+
+    # Average separation in pseudorapidity between two b-tagged jets (srap).
+    etasum = np.where(pairValid, np.abs(beta[:, i] - beta[:, j]), 0).sum(axis=1)
+    npairs = (btag ** 2 - btag) / 2
+    columns["srap"] = np.divide(etasum, npairs, out=np.full(nevents, -999.0), where=btag > 1)
+
+    # Chisquare of the two Higgs candidates from the leading b-tagged jets.
+    columns["chi"] = minChiSquare(bjets, btag, mass, nbjets)
+
+    return columns
+
+
+def flattenArrays(arrays, truthLabel, mass=higgsMass, nbjets=chiBjets, rng=None, points=None):
+    """
+    Computes all flat branches for a block of events.
+
+    arrays: dict of input branches (see inputBranches) as read by uproot.
+    truthLabel: label that identifies the data sample.
+    mass, nbjets: Higgs mass hypothesis and number of b-tagged jets for the chisquare.
+    rng: numpy random generator for the b-tagging emulation, seeded with seed if not given.
+    points: dict of b-tagging working points name -> (b-jets, c-jets, light-jets) efficiencies,
+            defaults to the defaultWorkingPoint.
+
+    The kinematics are computed once and reused for every working point.
+    Returns a dict of working point name -> dict of float32 numpy arrays keyed by branch name.
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    if points is None:
+        points = {defaultWorkingPoint: workingPoints[defaultWorkingPoint]}
+
+    numlep = firstValue(arrays["nlep"])
+    numjet = firstValue(arrays["njet"])
+    met = firstValue(arrays["met"])
+    metPhi = firstValue(arrays["met_phi"])
+    nevents = len(numjet)
+
+    # Jets padded to the largest multiplicity in the block, every jet enters the sums.
+    width = max(maxjets, int(arrays["jetpT"].counts.max(initial=0)))
+    jetpT = padJagged(arrays["jetpT"], width)
+    jeteta = padJagged(arrays["jeteta"], width)
+    jetphi = padJagged(arrays["jetphi"], width)
+    bhadron = padJagged(arrays["jetbhadron"], width)
+    chadron = padJagged(arrays["jetchadron"], width)
+    jetValid = np.arange(width) < numjet[:, None]
+
+    leppT = padJagged(arrays["leppT"], maxlepton)
+    lepeta = padJagged(arrays["lepeta"], maxlepton)
+    lepphi = padJagged(arrays["lepphi"], maxlepton)
+    lepflav = padJagged(arrays["lepflav"], maxlepton)
+
+    # Massless jet four vectors.
+    px = jetpT * np.cos(jetphi)
+    py = jetpT * np.sin(jetphi)
+    pz = jetpT * np.sinh(jeteta)
+    E = jetpT * np.cosh(jeteta)
+
+    columns = {}
+
+    # Leptons: four vector components, transverse mass and closest jet.
+    for n in range(1, maxlepton + 1):
+        exists = numlep >= n
+        dR = np.sqrt(
+            (jeteta - lepeta[:, n - 1, None]) ** 2
+            + deltaPhi(lepphi[:, n - 1, None], jetphi) ** 2
+        )
+        dR = np.where(jetValid, dR, np.inf).min(axis=1)
+        mt = np.sqrt(
+            2 * met * leppT[:, n - 1] / (10 ** 6)
+            * (1 - np.cos(deltaPhi(lepphi[:, n - 1], metPhi)))
+        )
+        columns["lepton%dpT" % n] = np.where(exists, leppT[:, n - 1], -999)
+        columns["lepton%deta" % n] = np.where(exists, lepeta[:, n - 1], -9)
+        columns["lepton%dphi" % n] = np.where(exists, lepphi[:, n - 1], -9)
+        columns["lepton%dflav" % n] = np.where(exists, lepflav[:, n - 1], -999)
+        columns["mt%d" % n] = np.where(exists, mt, -999)
+        columns["dr%d" % n] = np.where(exists & np.isfinite(dR), dR, -999)
+
+    # Jets: four vector components.
+    for name, values, dummy in (("pT", jetpT, -999), ("eta", jeteta, -9), ("phi", jetphi, -9)):
+        values = np.where(jetValid, values, dummy)
+        for n in range(1, maxjets + 1):
+            columns["jet%d%s" % (n, name)] = values[:, n - 1]
+
+    columns["numlep"] = numlep
+    columns["truth"] = np.full(nevents, truthLabel)
+    columns["numjet"] = numjet
+    columns["weights"] = firstValue(arrays["mcweight"])
+
+    # Scalar sum of Pt/E, dummy value to avoid division by zero.
+    sumPt = np.where(jetValid, jetpT, 0).sum(axis=1)
+    sumE = np.where(jetValid, E, 0).sum(axis=1)
+    columns["cent"] = np.divide(sumPt, sumE, out=np.full(nevents, -9999.0), where=sumE != 0)
+
+    columns["met"] = met
+    columns["metPhi"] = metPhi
+
+    # Same kinematics, one set of b-tag dependent branches per working point.
+    columns = {name: values.astype(np.float32) for name, values in columns.items()}
+    tagged = emulateBtagging(bhadron, chadron, jetValid, rng, points)
+    flat = {}
+    for point in points:
+        btag = btagColumns(tagged[point], jetpT, jeteta, [E, px, py, pz], jetValid, mass, nbjets)
+        btag = {name: values.astype(np.float32) for name, values in btag.items()}
+        flat[point] = {name: btag.get(name, columns.get(name)) for name in outputBranches()}
+    return flat
+
+
+def flattenChunk(task):
+    """
+    Worker: flattens the entries [entrystart, entrystop) of one file and saves them as a partial output (npz).
+    """
+    import uproot
+
+    filepath, entrystart, entrystop, partpath, options = task
+    tree = uproot.open(filepath)[treename]
+    arrays = tree.arrays(
+        inputBranches, entrystart=entrystart, entrystop=entrystop, namedecode="utf-8"
+    )
+    truthLabel = truthLabels[os.path.basename(filepath)]
+
+    # Each chunk has its own random stream, reproducible for a given seed and chunksize.
+    rng = np.random.default_rng([options["seed"], truthLabel, entrystart])
+    flat = flattenArrays(
+        arrays, truthLabel, options["mass"], options["nbjets"], rng, options["points"]
+    )
+
+    # Branches shared by all working points are stored once, the b-tag dependent ones with a suffix.
+    columns = {}
+    for point, branches in flat.items():
+        for branch, values in branches.items():
+            if branch in btagBranches():
+                branch += pointSuffix(point)
+            columns[branch] = values
+    np.savez(partpath, **columns)
+    return partpath, entrystop - entrystart
+
+
+def readParts(parts, select):
+    """
+    Yields the partial outputs in entry order.
+
+    select: dict of output branch name -> name in the partial outputs.
+    """
+    for partpath in parts:
+        with np.load(partpath) as part:
+            yield {branch: part[key] for branch, key in select.items()}
+
+
+def writeColumns(outpath, chunks, branches, fmt="root", compression=None):
+    """
+    Writes chunks of columns (dicts of branch name -> float32 array) one after the other to one new file.
+
+    branches: names of the columns, every chunk has all of them.
+    fmt: 'root' (tree written with uproot), 'parquet' or 'feather' (written with pyarrow).
+    compression: codec name (see compressionCodecs), defaults to zlib for root, zstd for parquet and
+                 lz4 for feather.
+    """
+    if fmt == "root":
+        import uproot
+
+        codecs = {"zlib": uproot.ZLIB(4), "lz4": uproot.LZ4(4), "lzma": uproot.LZMA(4)}
+        with uproot.recreate(outpath, compression=codecs[compression or compressionCodecs["root"][0]]) as output:
+            output[treename] = uproot.newtree({branch: np.float32 for branch in branches})
+            for columns in chunks:
+                output[treename].extend(columns)
+        return outpath
+
+    # Parquet and Feather need pyarrow, which is only required for these formats.
+    import pyarrow as pa
+
+    # Both are written one chunk (record batch) at a time, with the schema known up front so a sample
+    # without chunks still gives a readable, empty file.
+    schema = pa.schema([(branch, pa.float32()) for branch in branches])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(outpath, schema, compression=compression or compressionCodecs["parquet"][0])
+    elif fmt == "feather":
+        options = pa.ipc.IpcWriteOptions(compression=compression or compressionCodecs["feather"][0])
+        writer = pa.ipc.new_file(outpath, schema, options=options)
+    with writer:
+        for columns in chunks:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    return outpath
+
+
+def mergeParts(outpath, parts, select, fmt="root", compression=None):
+    """
+    Merges the partial outputs into one new file that only has the flat feature columns plus weights/truth.
+
+    select: dict of output branch name -> name in the partial outputs.
+    fmt, compression: see writeColumns.
+    """
+    return writeColumns(outpath, readParts(parts, select), list(select), fmt, compression)
+
+
+def outputLayout(filepath, fmt, points, layout):
+    """
+    Output files of one input and the branches each one gets from the partial outputs.
+
+    With one working point the file is new_<file>.<fmt> next to the input. With several, layout 'files'
+    writes one file per working point in flat_btageff_<point>/ and layout 'columns' writes one file with
+    the b-tag dependent branches of every working point side by side (suffix from pointSuffix).
+
+    Returns a dict of output path -> select (see mergeParts).
+    """
+    outdir = os.path.dirname(filepath)
+    outname = "new_" + os.path.splitext(os.path.basename(filepath))[0] + "." + fmt
+    tagged = btagBranches()
+
+    if len(points) > 1 and layout == "columns":
+        select = {b: b for b in outputBranches() if b not in tagged}
+        for point in points:
+            select.update({b + pointSuffix(point): b + pointSuffix(point) for b in tagged})
+        return {os.path.join(outdir, outname): select}
+
+    outputs = {}
+    for point in points:
+        select = {b: b + pointSuffix(point) if b in tagged else b for b in outputBranches()}
+        if len(points) > 1:
+            pointdir = os.path.join(outdir, "flat_btageff_" + point)
+            os.makedirs(pointdir, exist_ok=True)
+            outputs[os.path.join(pointdir, outname)] = select
+        else:
+            outputs[os.path.join(outdir, outname)] = select
+    return outputs
+
+
+def flattenFiles(
+    filepaths,
+    chunksize=100000,
+    workers=None,
+    mass=higgsMass,
+    nbjets=chiBjets,
+    fmt="root",
+    compression=None,
+    seed=seed,
+    points=None,
+    layout="files",
+):
+    """
+    Flattens several ROOT files (e.g. TTHH/TTBB/TTH/TTZ) at once.
+
+    Every tree is split into entry ranges of chunksize events and all the chunks of all the files are
+    processed in one process pool, so every core is used. Each input is read once for all the b-tagging
+    working points in points and written to fresh files (see outputLayout and mergeParts), the input
+    file is never copied.
+
+    Returns the list of output files.
+    """
+    import uproot
+
+    # Checked before any chunk is flattened, the codec is only used when the parts are merged.
+    if compression is not None and compression not in compressionCodecs[fmt]:
+        raise ValueError("%s output has no %s compression (%s)" % (fmt, compression, "/".join(compressionCodecs[fmt])))
+    if workers is None:
+        workers = os.cpu_count()
+    if points is None:
+        points = {defaultWorkingPoint: workingPoints[defaultWorkingPoint]}
+
+    options = {"mass": mass, "nbjets": nbjets, "seed": seed, "points": points}
+    tasks = []
+    outputs = []
+    for filepath in filepaths:
+        name = os.path.basename(filepath)
+        if name not in truthLabels:
+            print("Invalid ROOT file", filepath)
+            continue
+        partdir = tempfile.mkdtemp(prefix="new_" + name + ".", dir=os.path.dirname(filepath) or ".")
+        n_entries = uproot.open(filepath)[treename].numentries
+        parts = []
+        for entrystart in range(0, n_entries, chunksize):
+            partpath = os.path.join(partdir, "part%06d.npz" % (entrystart // chunksize))
+            entrystop = min(entrystart + chunksize, n_entries)
+            tasks.append((filepath, entrystart, entrystop, partpath, options))
+            parts.append(partpath)
+        outputs.append((partdir, parts, outputLayout(filepath, fmt, points, layout)))
+
+    n_entries = sum(task[2] - task[1] for task in tasks)
+    start_time = time.time()
+    processed = 0
+    written = []
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for partpath, nevents in pool.imap_unordered(flattenChunk, tasks):
+                processed += nevents
+
+                # Show some progress
+                print(
+                    "   processing entry {:8d}/{:d} [{:5.0f} evts/s]".format(
+                        processed, n_entries, processed / (time.time() - start_time)
+                    )
+                )
+
+        for partdir, parts, layoutFiles in outputs:
+            for outpath, select in layoutFiles.items():
+                written.append(mergeParts(outpath, parts, select, fmt, compression))
+                print(outpath)
+    finally:
+        # The partial outputs are removed even when a chunk or a merge fails.
+        for partdir, parts, layoutFiles in outputs:
+            shutil.rmtree(partdir, ignore_errors=True)
+    return written
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="columnar flatten/augment ntuples")
+    parser.add_argument("--file", nargs="+", help="input ROOT files, e.g. TTHH.root TTBB.root TTH.root TTZ.root")
+    parser.add_argument("--chunksize", type=int, default=100000, help="events per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument("--higgs-mass", type=float, default=higgsMass, help="Higgs mass hypothesis [MeV] for chi")
+    parser.add_argument("--chi-bjets", type=int, default=chiBjets, choices=[4, 6, 8], help="b-tagged jets used for chi")
+    parser.add_argument("--format", default="root", choices=["root", "parquet", "feather"], help="output format")
+    parser.add_argument(
+        "--compression",
+        default=None,
+        help="compression codec (%s)" % ", ".join("%s: %s" % (fmt, "/".join(c)) for fmt, c in compressionCodecs.items()),
+    )
+    parser.add_argument("--seed", type=int, default=seed, help="seed of the b-tagging emulation")
+    parser.add_argument("--btag-wp", nargs="+", default=[defaultWorkingPoint], choices=sorted(workingPoints), help="b-tagging working points")
+    parser.add_argument("--btag-eff", type=float, nargs=3, metavar=("B", "C", "LIGHT"), help="custom b-tagging efficiencies")
+    parser.add_argument("--wp-layout", default="files", choices=["files", "columns"], help="one file per working point or suffixed columns")
+    args = parser.parse_args()
+    if args.compression is not None and args.compression not in compressionCodecs[args.format]:
+        parser.error("--format %s takes --compression %s" % (args.format, "/".join(compressionCodecs[args.format])))
+
+    if args.btag_eff:
+        points = {"%g" % args.btag_eff[0]: tuple(args.btag_eff)}
+    else:
+        points = {point: workingPoints[point] for point in args.btag_wp}
+    flattenFiles(
+        args.file,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        mass=args.higgs_mass,
+        nbjets=args.chi_bjets,
+        fmt=args.format,
+        compression=args.compression,
+        seed=args.seed,
+        points=points,
+        layout=args.wp_layout,
+    )
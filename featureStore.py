@@ -0,0 +1,343 @@
+# Written By : Jonathan O. Tellechea
+# Adviser    : Mike Hance, Phd
+# Research   : Using a neural network to maximize the significance of tttHH production.
+# Description: On disk cache of the assembled four sample dataset (X, y, weights, truth), keyed by the content of the
+#              flattened files, the branch list and the seed. A second run with the same configuration memory maps the
+#              cached arrays instead of parsing the ROOT files again. The arrays are float32 and written in place one
+#              sample at a time, the train/test/evaluation sets are index arrays into them.
+###########################################################################################################################
+# Imported packages.
+import os
+import json
+import hashlib
+import numpy as np
+from numpy.lib.format import open_memmap
+import slug
+
+# Directory where the assembled datasets are stored.
+cacheDir = "cache"
+
+# Flattened samples, the signal must be first.
+samples = ["new_TTHH", "new_TTBB", "new_TTH", "new_TTZ"]
+
+# Arrays stored for each dataset.
+arrays = ["X", "y", "weights", "truth"]
+
+# Layout of the stored arrays, part of the key so caches written in an older layout are rebuilt.
+cacheVersion = 2
+
+# Number of rows scaled at a time.
+chunksize = 2 ** 18
+
+
+def fileDigest(path, cache=cacheDir, blocksize=2 ** 20):
+    """
+    sha1 of the content of a file.
+
+    Digests are remembered in <cache>/digests.json by path, size and modification time, so large
+    files are only read again when they change.
+    """
+    stat = os.stat(path)
+    stamp = "%s:%d:%d" % (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digestfile = os.path.join(cache, "digests.json")
+    digests = {}
+    if os.path.exists(digestfile):
+        with open(digestfile) as f:
+            digests = json.load(f)
+    if stamp not in digests:
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(blocksize), b""):
+                sha.update(block)
+        digests[stamp] = sha.hexdigest()
+        os.makedirs(cache, exist_ok=True)
+        tmpfile = "%s.%d" % (digestfile, os.getpid())
+        with open(tmpfile, "w") as f:
+            json.dump(digests, f, indent=1)
+        os.replace(tmpfile, digestfile)
+    return digests[stamp]
+
+
+def datasetKey(paths, branches, seed, cache=cacheDir):
+    """
+    Key of a dataset: hash of the file contents, the branch list and the seed.
+    """
+    sha = hashlib.sha1(str(cacheVersion).encode())
+    for path in paths:
+        sha.update(fileDigest(path, cache).encode())
+    sha.update(json.dumps(branches).encode())
+    sha.update(str(seed).encode())
+    return sha.hexdigest()[:16]
+
+
+def sampleEntries(path):
+    """
+    Number of events in a flattened sample, read from the file metadata.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetFile(path).metadata.num_rows
+    if path.endswith(".feather"):
+        import pyarrow
+
+        reader = pyarrow.ipc.open_file(pyarrow.memory_map(path))
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    import uproot
+
+    return uproot.open(path)[slug.tree].numentries
+
+
+def assemble(paths, branches, seed, location, timings=None):
+    """
+    Signal followed by the shuffled backgrounds, as the training script always built it.
+
+    The arrays (see arrays) are preallocated as float32 .npy files in location and every sample is
+    written straight into its rows, so only one sample is held in memory at a time. The backgrounds
+    land in the same order sklearn.utils.shuffle gives their concatenation.
+
+    timings: dict the seconds spent reading the samples ('load') and placing their rows
+             ('concat/shuffle') are added to, see slug.span.
+
+    Returns the number of signal events.
+    """
+    from sklearn.utils import shuffle
+
+    if timings is None:
+        timings = {}
+    entries = [sampleEntries(path) for path in paths]
+    nsig, total = entries[0], sum(entries)
+    features = branches[:-2]
+
+    out = {
+        name: open_memmap(
+            os.path.join(location, name + ".npy"),
+            mode="w+",
+            dtype=np.float32,
+            shape=(total, len(features)) if name == "X" else (total,),
+        )
+        for name in arrays
+    }
+
+    # Row of each background event once the concatenated backgrounds are shuffled.
+    order = shuffle(np.arange(total - nsig), random_state=seed)
+    rows = np.empty_like(order)
+    rows[order] = np.arange(len(order)) + nsig
+    destinations = [np.arange(nsig)] + np.split(rows, np.cumsum(entries[1:-1]))
+
+    for path, rows in zip(paths, destinations):
+        with slug.span(timings, "load"):
+            df = slug.readSample(path, branches)
+        with slug.span(timings, "concat/shuffle"):
+            out["X"][rows] = df[features].values
+            out["weights"][rows] = df["weights"].values
+            out["truth"][rows] = df["truth"].values
+        del df
+    with slug.span(timings, "concat/shuffle"):
+        out["y"][:nsig] = 1
+        out["y"][nsig:] = 0
+        for array in out.values():
+            array.flush()
+    return nsig
+
+
+def loadDataset(
+    directory, phase, numofjets, seed=slug.seed, cache=cacheDir, extension=".root", branches=None, timings=None
+):
+    """
+    Dataset of the flattened samples in directory for a phase and number of jets.
+
+    extension: format of the flattened samples, .root, .parquet or .feather.
+    branches: branch list, slug.dataCol(phase, numofjets) by default (e.g. the one saved with a model).
+    timings: dict the seconds spent loading ('load') and, on the first call, concatenating and
+             shuffling the samples ('concat/shuffle') are added to.
+
+    The first call assembles the data and stores it in <cache>/<key>/, later calls with the same files,
+    branches and seed memory map the stored arrays.
+
+    Returns a dict with the arrays X, y, weights and truth plus 'branches', 'nsig' (number of signal
+    events, they come first) and 'key' (dataset fingerprint).
+    """
+    if timings is None:
+        timings = {}
+    paths = [os.path.join(os.path.expanduser(directory), sample + extension) for sample in samples]
+    if branches is None:
+        branches = slug.dataCol(phase, numofjets)
+    key = datasetKey(paths, branches, seed, cache)
+    location = os.path.join(cache, key)
+
+    if not os.path.exists(os.path.join(location, "meta.json")):
+        print("Building dataset cache", location)
+
+        # Written to a temporary directory first, so a crash never leaves half a cache behind.
+        tmpdir = "%s.%d" % (location, os.getpid())
+        os.makedirs(tmpdir, exist_ok=True)
+        nsig = assemble(paths, branches, seed, tmpdir, timings)
+        meta = {"branches": branches, "nsig": nsig, "paths": paths, "seed": seed}
+        with open(os.path.join(tmpdir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        try:
+            os.rename(tmpdir, location)
+        except OSError:
+            # Another run stored the same dataset first.
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+    with slug.span(timings, "load"):
+        with open(os.path.join(location, "meta.json")) as f:
+            meta = json.load(f)
+        data = {name: np.load(os.path.join(location, name + ".npy"), mmap_mode="r") for name in arrays}
+    data.update({"branches": meta["branches"], "nsig": meta["nsig"], "key": key})
+    return data
+
+
+def frame(data):
+    """
+    Data frame of a dataset with one column per branch, same layout as the concatenated samples.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(np.asarray(data["X"]), columns=data["branches"][:-2])
+    df["weights"] = data["weights"]
+    df["truth"] = data["truth"]
+    return df
+
+
+def fitScaler(data, cache=cacheDir):
+    """
+    StandardScaler of X, fitted in chunks and stored with the dataset (scaler.pxl).
+    """
+    import joblib
+    from sklearn.preprocessing import StandardScaler
+
+    scalerfile = os.path.join(cache, data["key"], "scaler.pxl")
+    if not os.path.exists(scalerfile):
+        X = data["X"]
+        scaler = StandardScaler()
+        for start in range(0, len(X), chunksize):
+            scaler.partial_fit(X[start : start + chunksize])
+        tmpfile = "%s.%d" % (scalerfile, os.getpid())
+        joblib.dump(scaler, tmpfile)
+        os.replace(tmpfile, scalerfile)
+
+    return joblib.load(scalerfile)
+
+
+def saveScaler(scaler, phase):
+    """
+    Saves the scaler of a training as phaseN-Scaler.pxl, like slug.scaleData does, so models saved
+    without their preprocessing are loaded with the scaler of the last training of their phase
+    (see slug.loadPreprocessing). Written through a temporary file, readers never see half of it.
+    """
+    import joblib
+
+    path = "phase" + str(phase) + "-Scaler.pxl"
+    tmpfile = "%s.%d" % (path, os.getpid())
+    joblib.dump(scaler, tmpfile)
+    os.replace(tmpfile, path)
+    print("Saved scaler!")
+
+
+def scaleDataset(data, cache=cacheDir):
+    """
+    X scaled to have 0 mean with a variance of unity, like slug.scaleData but transformed in chunks
+    into a float32 array stored with the dataset (Xscaled.npy).
+
+    Returns the scaled X memory mapped.
+    """
+    scaler = fitScaler(data, cache)
+    scaledfile = os.path.join(cache, data["key"], "Xscaled.npy")
+    X = data["X"]
+
+    if not os.path.exists(scaledfile):
+        tmpfile = "%s.%d.npy" % (scaledfile[:-4], os.getpid())
+        scaled = open_memmap(tmpfile, mode="w+", dtype=np.float32, shape=X.shape)
+        for start in range(0, len(X), chunksize):
+            scaled[start : start + chunksize] = scaler.transform(X[start : start + chunksize])
+        scaled.flush()
+        del scaled
+        os.replace(tmpfile, scaledfile)
+
+    return np.load(scaledfile, mmap_mode="r")
+
+
+def splitIndices(y, seed=slug.seed, evalSize=0.01, testSize=0.2):
+    """
+    Train, test and evaluation sets as index arrays into the dataset.
+
+    Same partition as the two stratified train_test_split calls of the training script, without
+    copying X; rows are only gathered (X[train]) when a set is used.
+    """
+    from sklearn.model_selection import train_test_split
+
+    index = np.arange(len(y))
+    dev, evaluate = train_test_split(index, test_size=evalSize, random_state=seed, stratify=y)
+    train, test = train_test_split(dev, test_size=testSize, random_state=seed, stratify=y[dev])
+    return train, test, evaluate
+
+
+def tfDataset(data, rows, scaler, batchSize, shuffleBuffer=0, seed=slug.seed):
+    """
+    tf.data pipeline over some rows of a dataset, so model.fit never needs them gathered in memory.
+
+    Batches are read from the unscaled X, scaled on the fly with the scaler's mean and scale, and
+    prepared in parallel ahead of the training step. With shuffleBuffer > 0 the rows are shuffled
+    within a buffer of that many rows, differently on every epoch.
+
+    Returns a tf.data.Dataset of (X, y) batches.
+    """
+    import tensorflow as tf
+
+    X, y = data["X"], data["y"]
+    mean = scaler.mean_.astype(np.float32)
+    scale = scaler.scale_.astype(np.float32)
+
+    def gather(batch):
+        return X[batch], y[batch]
+
+    def load(batch):
+        features, labels = tf.numpy_function(gather, [batch], (tf.float32, tf.float32))
+        features.set_shape([None, X.shape[1]])
+        labels.set_shape([None])
+        return (features - mean) / scale, labels
+
+    dataset = tf.data.Dataset.from_tensor_slices(rows)
+    if shuffleBuffer > 0:
+        dataset = dataset.shuffle(shuffleBuffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batchSize).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def predictScores(model, modelFile, data, scaler, cache=cacheDir, chunksize=2 ** 16):
+    """
+    NN score of every event of a dataset, in dataset order (signal first).
+
+    The events are scaled with scaler and predicted once per model file, dataset and scaler; the
+    scores are stored with the dataset (scores-<key>.npy) and later calls only load them.
+
+    model: keras model of modelFile, loaded from modelFile when None and the scores are not stored yet.
+
+    Returns the scores memory mapped.
+    """
+    sha = hashlib.sha1(fileDigest(modelFile, cache).encode())
+    sha.update(scaler.mean_.tobytes())
+    sha.update(scaler.scale_.tobytes())
+    scorefile = os.path.join(cache, data["key"], "scores-%s.npy" % sha.hexdigest()[:16])
+
+    if not os.path.exists(scorefile):
+        if model is None:
+            from tensorflow.keras.models import load_model
+
+            model = load_model(modelFile)
+        X = data["X"]
+        tmpfile = "%s.%d.npy" % (scorefile[:-4], os.getpid())
+        scores = open_memmap(tmpfile, mode="w+", dtype=np.float32, shape=(len(X),))
+        for start in range(0, len(X), chunksize):
+            rows = scaler.transform(X[start : start + chunksize]).astype(np.float32)
+            scores[start : start + chunksize] = model.predict(rows, batch_size=8192).ravel()
+        scores.flush()
+        del scores
+        os.replace(tmpfile, scorefile)
+
+    return np.load(scorefile, mmap_mode="r")
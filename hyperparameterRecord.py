@@ -2,13 +2,14 @@
 # Adviser    : Mike Hance, Phd
 # Research   : Using a neural network to maximize the significance of tttHH production.
 # Description: This script keeps a record of trained NN; Keeps track of time , AUC , lenght of NN etc. 
-# The filename for the saved weights is displayed to be used in loadNN.py to create plots.
+# The filename for the saved weights is displayed to be used in loadNN.py to create plots. The runs are read from the
+# registry database (registry.py), ranked by max significance by default.
 # Reference  :http://cdsweb.cern.ch/record/2220969/files/ATL-PHYS-PUB-2016-023.pdf
 ###########################################################################################################################
 # Imported packages.
-import pandas as pd
 import numpy as np
 import argparse
+import registry  # Record of the trained NN.
 
 
 ####work in progress to automate script
@@ -26,17 +27,33 @@ import argparse
 # file = 'csv/jet.csv'
 # file = 'csv/tenlayers.csv'
 # file = 'csv/highlevelvariables.csv'
-file = 'csv/aug.csv'
+# file = 'csv/aug.csv'
+parser = argparse.ArgumentParser(description="Runs of the NN registry, best first")
+parser.add_argument("--db", default=registry.registryFile, help="registry database")
+parser.add_argument("--sort", default="signif", choices=registry.columns + ["id"], help="column the runs are ranked by")
+parser.add_argument("--ascending", action="store_true", help="lowest first (e.g. --sort runtime)")
+parser.add_argument("--limit", type=int, default=None, help="number of runs shown")
+parser.add_argument("--dataset", default=None, help="only the runs of a dataset fingerprint")
+parser.add_argument("--import", dest="csv", default=None, help="first add the runs of an old record csv (e.g. csv/aug.csv)")
+args = parser.parse_args()
+
+if args.csv:
+    print("Imported %d runs from %s" % (registry.importCsv(args.csv, args.db), args.csv))
+
 modelParam = [
-        'FileName',
-        "ConfusionMatrix [TP FP] [FN TN]",
-        "Run Time",
-        "AUC",
-        "Avg.P",
-        "Score",
-        "Max Signif",
-        "nsig",
-        "nbkg"
+        'model',
+        'layers',
+        'batch',
+        'rate',
+        'epochs',
+        'runtime',
+        'auc',
+        'avgp',
+        'score',
+        'signif',
+        'nsig',
+        'nbkg'
     ]
-data = pd.read_csv(file)
-print(data.to_string(justify='right',columns=modelParam,header=True,index=1))
\ No newline at end of file
+where, params = (None, ()) if args.dataset is None else ("dataset = ?", (args.dataset,))
+data = registry.queryRuns(args.db, args.sort, not args.ascending, args.limit, where, params)
+print(data.to_string(justify='right',columns=modelParam,header=True,index=1))
@@ -1,16 +1,265 @@
 # Written By : Jonathan O. Tellechea
 # Adviser    : Mike Hance, Phd
 # Research   : Using a neural network to maximize the significance of tttHH production.
-# Description: This will repeat nnKerasGPU.py multiple times to run it multiple times unsupervised. Must be edited to run scenario of interest.
+# Description: Runs nnKerasGPU.main for a grid of (LAYER, BATCH, RATE) configurations unsupervised. The dataset is loaded
+#              once and shared by a pool of worker processes that train the configurations in parallel, each one limited
+#              to a few threads. Every run is recorded in the registry (registry.py). With --schedule halving or hyperband
+#              every configuration is trained for a few epochs and only the best fraction keeps training.
 # Reference  :http://cdsweb.cern.ch/record/2220969/files/ATL-PHYS-PUB-2016-023.pdf
 ###########################################################################################################################
 # Imported packages.
-import nnKerasGPU as nn
+import os, time, argparse
+import math
+import random
+import itertools
+import multiprocessing
+import numpy as np
+from threadpoolctl import threadpool_limits
+import slug
+import featureStore
+import registry  # Record of the trained NN.
+import nnKerasGPU as nn  # Cheap to import, the dataset is only loaded by nn.setup().
 
-# This runs nnKerasGPU.py multiple times. A for loop can be used to varry the parameters. 
-for i in range(1,4):
-	nn.main(i+4,1024,0)
 
+def configurations(layers, batches, rates, configs=None):
+    """
+    Every (LAYER, BATCH, RATE) combination of the grid plus the configurations given one by one,
+    without repetitions.
+    """
+    grid = list(itertools.product(layers, batches, rates)) + [tuple(config) for config in configs or []]
+    return sorted(set((int(layer), int(batch), float(rate)) for layer, batch, rate in grid))
 
 
+def limitThreads(threads):
+    """
+    Worker initializer: tensorflow and numpy use at most threads cores in each worker.
+    """
+    import tensorflow as tf
 
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    threadpool_limits(threads)
+
+
+def train(config):
+    """
+    Trains one configuration in a worker process, returns it with its record (see nnKerasGPU.main).
+    """
+    LAYER, BATCH, RATE = config
+    return config, nn.main(LAYER, BATCH, RATE)
+
+
+def modelFile(directory, config):
+    """
+    Model of a configuration in a scheduled sweep, named like the models of nnKerasGPU.main.
+    """
+    LAYER, BATCH, RATE = config
+    h5name = "numLayers%d.numBranches%d.batchSize%d.rate%s.h5" % (LAYER, nn.numBranches, BATCH, RATE)
+    return os.path.join(directory, h5name)
+
+
+def testMetrics(model):
+    """
+    AUC, average precision and max significance (with its score cut and yields) of the test set,
+    the yields scaled up to the size of the full dataset. Keys are registry columns.
+    """
+    from sklearn.metrics import average_precision_score, roc_auc_score
+
+    rows = nn.test
+    if nn.args.stream:
+        scores = model.predict(featureStore.tfDataset(nn.data, rows, nn.scaler, 8192), verbose=0)
+    else:
+        scores = model.predict(nn.Xscaled[rows], batch_size=8192, verbose=0)
+    scores = scores.ravel()
+    signal = nn.y[rows] > 0.5
+
+    # Signal events count scalefactor each and background events 1, unless --weighted.
+    weights = np.where(signal, nn.scalefactor, 1.0) * len(nn.y) / len(rows)
+    if nn.args.weighted:
+        weights = weights * nn.data["weights"][rows]
+    thresholds, s, b = slug.weightedYields(scores[signal], scores[~signal], weights[signal], weights[~signal])
+    score, signif, nsig, nbkg = slug.maxSignificance(s, b, thresholds=thresholds)
+    return {
+        "auc": roc_auc_score(signal, scores),
+        "avgp": average_precision_score(signal, scores),
+        "score": score,
+        "signif": signif,
+        "nsig": nsig,
+        "nbkg": nbkg,
+    }
+
+
+def trainRung(task):
+    """
+    Trains one configuration of a scheduled sweep in a worker process from epoch start to epoch stop.
+
+    The model (with the optimizer state) is saved after every rung and loaded again by the next one,
+    so a promoted configuration continues where it stopped. Every rung is recorded in the registry
+    with the metrics of the test set at epoch stop.
+
+    Returns the configuration and its metric at epoch stop, val_loss or the test max significance.
+    """
+    config, start, stop, metric, directory = task
+    LAYER, BATCH, RATE = config
+    filename = modelFile(directory, config)
+    timings = {}
+    startTime = time.time()
+    with slug.span(timings, "build"):
+        if start:
+            from tensorflow.keras.models import load_model
+
+            model = load_model(filename)
+        else:
+            model = nn.build_model(LAYER, RATE)
+    with slug.span(timings, "fit"):
+        history = model.fit(
+            initial_epoch=start, epochs=stop, verbose=0, callbacks=[nn.epochTimer(timings)], **nn.trainingData(BATCH)
+        )
+    with slug.span(timings, "save"):
+        model.save(filename)
+    with slug.span(timings, "inference"):
+        run = testMetrics(model)
+    timings["total"] = time.time() - startTime
+
+    valLoss = history.history["val_loss"][-1]
+    run.update(
+        {
+            "model": filename,
+            "dataset": nn.data["key"],
+            "phase": nn.phase,
+            "numofjets": nn.numofjets,
+            "layers": LAYER,
+            "batch": BATCH,
+            "rate": RATE,
+            "epochs": stop,
+            "config": {
+                "sweep": directory,
+                "initial_epoch": start,
+                "metric": metric,
+                "val_loss": valLoss,
+                "stream": nn.args.stream,
+                "weighted": nn.args.weighted,
+            },
+            "runtime": timings["total"],
+            "peakrss": slug.peakMemory(),
+        }
+    )
+    registry.recordRun(run, timings)
+    if metric == "signif":
+        return config, run["signif"]
+    return config, valLoss
+
+
+def successiveHalving(pool, configs, minEpochs, maxEpochs, eta, metric, directory):
+    """
+    Successive halving: every configuration is trained for minEpochs, the best 1/eta of them are
+    trained eta times longer, and so on until maxEpochs. The others stop at the rung they reached.
+
+    Returns the configurations of the last rung with their metric, best first.
+    """
+    os.makedirs(directory, exist_ok=True)
+    survivors, start, stop = list(configs), 0, minEpochs
+    while True:
+        # A single survivor has nothing to be compared to, it goes straight to maxEpochs.
+        if len(survivors) == 1:
+            stop = maxEpochs
+        tasks = [(config, start, stop, metric, directory) for config in survivors]
+        results = pool.imap_unordered(trainRung, tasks)
+        ranking = sorted(results, key=lambda result: result[1], reverse=metric == "signif")
+        for config, value in ranking:
+            print("   epoch {:4d} LAYER={} BATCH={} RATE={} {} = {:.4f}".format(stop, *config, metric, value))
+        if stop >= maxEpochs:
+            return ranking
+        survivors = [config for config, value in ranking[: max(1, len(ranking) // eta)]]
+        start, stop = stop, min(maxEpochs, stop * eta)
+
+
+def hyperband(pool, configs, minEpochs, maxEpochs, eta, metric, directory, seed=42):
+    """
+    Hyperband: successive halving brackets from the most aggressive one (many configurations started
+    with minEpochs) to plain training (a few configurations with maxEpochs). Each bracket draws its
+    configurations from configs.
+
+    Returns the configurations that reached maxEpochs with their metric, best first.
+    """
+    rng = random.Random(seed)
+    brackets = int(math.log(maxEpochs / minEpochs, eta) + 1e-9)
+    finalists = []
+    for s in range(brackets, -1, -1):
+        n = int(math.ceil((brackets + 1) / (s + 1) * eta ** s))
+        epochs = max(1, int(round(maxEpochs / eta ** s)))
+        print("Bracket %d: %d configurations from %d epochs" % (s, min(n, len(configs)), epochs))
+        sample = rng.sample(configs, min(n, len(configs)))
+        bracket = os.path.join(directory, "bracket%d" % s)
+        ranking = successiveHalving(pool, sample, epochs, maxEpochs, eta, metric, bracket)
+        finalists += [(config, value, bracket) for config, value in ranking]
+    return sorted(finalists, key=lambda result: result[1], reverse=metric == "signif")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Trains nnKerasGPU.py for a grid of configurations in parallel, other options go to nnKerasGPU.py"
+    )
+    parser.add_argument("--layers", type=int, nargs="+", default=[5, 6, 7], help="LAYER values of the grid")
+    parser.add_argument("--batches", type=int, nargs="+", default=[1024], help="BATCH values of the grid")
+    parser.add_argument("--rates", type=float, nargs="+", default=[0.0], help="RATE values of the grid")
+    parser.add_argument(
+        "--config",
+        nargs=3,
+        action="append",
+        metavar=("LAYER", "BATCH", "RATE"),
+        help="extra configuration, can be repeated",
+    )
+    parser.add_argument("--threads", type=int, default=4, help="cores used by each training")
+    parser.add_argument("--workers", type=int, default=None, help="trainings at a time (default: cores / threads)")
+    parser.add_argument(
+        "--schedule",
+        default="grid",
+        choices=["grid", "halving", "hyperband"],
+        help="grid: every configuration is trained to the end, halving/hyperband: only the best ones",
+    )
+    parser.add_argument("--min-epochs", type=int, default=5, help="epochs of the first rung (halving)")
+    parser.add_argument("--max-epochs", type=int, default=150, help="epochs of the last rung")
+    parser.add_argument("--eta", type=int, default=3, help="1/eta of the configurations are promoted at each rung")
+    parser.add_argument(
+        "--metric", default="val_loss", choices=["val_loss", "signif"], help="metric configurations are ranked by"
+    )
+    parser.add_argument("--outdir", default=None, help="models of a scheduled sweep (default: data/sweep.<date>)")
+    args = parser.parse_known_args()[0]
+
+    configs = configurations(args.layers, args.batches, args.rates, args.config)
+    workers = args.workers or max(1, os.cpu_count() // args.threads)
+
+    # The dataset is loaded (or read from the feature store cache) and scaled once here, the forked workers share it.
+    nn.setup(strict=False)
+
+    start_time = time.time()
+    context = multiprocessing.get_context("fork")
+    # A fresh process per training, so no keras state is carried from one model to the next.
+    with context.Pool(workers, limitThreads, (args.threads,), maxtasksperchild=1) as pool:
+        if args.schedule == "grid":
+            print("Training %d configurations, %d at a time" % (len(configs), workers))
+            for done, (config, record) in enumerate(pool.imap_unordered(train, configs), 1):
+                print(
+                    "   finished {}/{} LAYER={} BATCH={} RATE={} [{:.0f} s]".format(
+                        done, len(configs), *config, time.time() - start_time
+                    )
+                )
+        else:
+            directory = args.outdir or "data/sweep." + time.strftime("%Y.%m.%d_%H.%M.%S")
+            print("Scheduling %d configurations, %d at a time, in %s" % (len(configs), workers, directory))
+            if args.schedule == "halving":
+                ranking = successiveHalving(
+                    pool, configs, args.min_epochs, args.max_epochs, args.eta, args.metric, directory
+                )
+                ranking = [(config, value, directory) for config, value in ranking]
+            else:
+                ranking = hyperband(pool, configs, args.min_epochs, args.max_epochs, args.eta, args.metric, directory)
+
+            # The trained models can be used like the ones of nnKerasGPU.py (loadNN.py, rocs.py, scoreNN.py).
+            print("Best configurations [{:.0f} s]".format(time.time() - start_time))
+            for config, value, location in ranking:
+                filename = modelFile(location, config)
+                slug.savePreprocessing(filename, nn.scaler, nn.branches, nn.phase, nn.numofjets)
+                print("   {} = {:.4f} {}".format(args.metric, value, filename))
@@ -5,51 +5,52 @@
 # Reference  :http://cdsweb.cern.ch/record/2220969/files/ATL-PHYS-PUB-2016-023.pdf
 ###########################################################################################################################
 # Imported packages.
-import csv, sys
-import uproot
-import pandas as pd
+import csv, sys, os
 import numpy as np
 from numpy import array
 
 np.set_printoptions(threshold=sys.maxsize)
-import shap
 import argparse
-import tensorflow as tf
-import tkinter
-import matplotlib
-# matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
 
 import math
 import time
 from math import log, sqrt
-from tensorflow import keras
-from tensorflow.keras import metrics
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Dropout, Activation
-from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-from sklearn.model_selection import train_test_split
-from sklearn.utils import shuffle
-
-status = len(tf.config.experimental.list_physical_devices("GPU"))
-
-from sklearn.metrics import (
-    precision_recall_curve,
-    plot_precision_recall_curve,
-    average_precision_score,
-    roc_curve,
-    auc,
-    roc_auc_score,
-    precision_recall_curve,
-)
-from sklearn.metrics import confusion_matrix
 from datetime import datetime
 import slug  # Library with common functions used in multiple scripts.
+import featureStore  # Cache of the assembled dataset.
+import registry  # Record of the trained NN.
+
+# tensorflow, sklearn, pandas, matplotlib and shap are imported by the functions that use them: importing this
+# script (multiNN.py) or asking for --help does not load them.
 
 parser = argparse.ArgumentParser(description="number of jets")
 parser.add_argument("--num", type=str, help="Use '--num=' followed by a Number of jets")
-args = parser.parse_args()
+parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Stream training batches from the dataset cache with tf.data instead of loading them in memory "
+    "(every training otherwise holds a copy of the scaled dataset, use it for the large phases)",
+)
+parser.add_argument(
+    "--buffer",
+    type=int,
+    default=2 ** 20,
+    help="Use '--buffer=' followed by the shuffle buffer size (events) of --stream",
+)
+parser.add_argument(
+    "--weighted", action="store_true", help="Use the event weights in the significance scan"
+)
+parser.add_argument(
+    "--bfloat16",
+    action="store_true",
+    help="Compute the hidden layers in bfloat16 (mixed precision), the weights and the output stay float32",
+)
+parser.add_argument(
+    "--format",
+    default="root",
+    choices=["root", "parquet", "feather"],
+    help="format of the flattened samples (see columnarFlatten.py --format)",
+)
 # numofjets = int(args.num)
 numofjets = 10
 
@@ -67,49 +68,154 @@ numBranches = len(branches) - 2
 mikeHancePATH = '/data/users/mhance/tthh/'
 jTellecheaPATH = '~/neural_networks/data/flat_btageff_0.77/'
 # jTellecheaPATH = '~/neural_networks/data/flat_btageff_0.85/'
-# Data read from file.
-signal = uproot.open(jTellecheaPATH+"new_TTHH.root")[tree]
-df_signal = signal.pandas.df(branches)
 
-bkgTTBB = uproot.open(jTellecheaPATH+"new_TTBB.root")[tree]
-df_bkgTTBB = bkgTTBB.pandas.df(branches)
+# Seconds spent in each phase of the pipeline (see slug.span). Loading happens once and is part of every run of main.
+pipelineTimings = {}
 
-bkgTTH = uproot.open(jTellecheaPATH+"new_TTH.root")[tree]
-df_bkgTTH = bkgTTH.pandas.df(branches)
+# Signal
+scalefactor = 0.00232 * 0.608791
 
-bkgTTZ = uproot.open(jTellecheaPATH+"new_TTZ.root")[tree]
-df_bkgTTZ = bkgTTZ.pandas.df(branches)
+# Options, dataset, scaler, scaled X, labels and train/test/evaluation sets, set by setup.
+args = data = nsig = scaler = Xscaled = sigw = bkgw = y = train = test = evaluate = None
 
-df_background = pd.concat([df_bkgTTBB, df_bkgTTH, df_bkgTTZ])
 
-# The 3 backgrounds are concatenated we shuffle to make sure they are not sorted.
-shuffleBackground = shuffle(df_background, random_state=seed)
+def setup(argv=None, strict=True):
+    """
+    Parses the options and loads the dataset of the module: data, the fitted scaler, the labels y and
+    the train/test/evaluation sets that build_model, trainingData and main use. Called once, when
+    the script starts or by the scripts importing it (multiNN.py).
 
-# Signal and shuffle background data.
-rawdata = pd.concat([df_signal, shuffleBackground])
+    strict: unknown options are an error, like parse_args; multiNN.py passes False, its own options
+            are left to it.
+    """
+    global args, data, nsig, scaler, Xscaled, sigw, bkgw, y, train, test, evaluate
 
-X = rawdata.drop(["weights", "truth"], axis=1)
+    if strict:
+        args = parser.parse_args(argv)
+    else:
+        # Options of other scripts that import this one (multiNN.py) are left to them.
+        args = parser.parse_known_args(argv)[0]
 
-X = slug.scaleData(X,phase)
+    # Signal and shuffled backgrounds, read from the feature store cache after the first run.
+    data = featureStore.loadDataset(
+        jTellecheaPATH, phase, numofjets, seed, extension="." + args.format, timings=pipelineTimings
+    )
+    nsig = data["nsig"]
 
+    # Scaler fitted on the full dataset. Without --stream the scaled X is also built (or read from the
+    # cache) here, before multiNN.py forks its workers, so they only read it.
+    with slug.span(pipelineTimings, "scale"):
+        scaler = featureStore.fitScaler(data)
+        if not args.stream:
+            Xscaled = featureStore.scaleDataset(data)
+    # Saved by every run (once, before its workers start, for multiNN.py), as the scaler of this phase for
+    # the models saved without preprocessing.
+    featureStore.saveScaler(scaler, phase)
 
-# Signal
-scalefactor = 0.00232 * 0.608791
-sigw = rawdata["weights"][: len(signal)] * scalefactor
-bkgw = rawdata["weights"][len(signal) :]
+    sigw = data["weights"][:nsig] * scalefactor
+    bkgw = data["weights"][nsig:]
 
-# Labeling data with 1's and 0's to distinguish.(1/positve/signal and 0/negative/background)
-# Truth Labels.
-y = np.concatenate((np.ones(len(df_signal)), np.zeros(len(shuffleBackground))))
+    # Labeling data with 1's and 0's to distinguish.(1/positve/signal and 0/negative/background)
+    # Truth Labels.
+    y = data["y"]
 
+    # Shuffle full data and split into train/test and validation set.
+    # The sets are index arrays into the dataset, the rows are gathered or streamed in main.
+    with slug.span(pipelineTimings, "split"):
+        train, test, evaluate = featureStore.splitIndices(y, seed)
+
+
+# NN model defined as a function.
+def build_model(LAYER, RATE):
+    """
+    Compiled NN of main's structure: LAYER layers of numBranches neurons with drop out RATE.
+    """
+    import tensorflow as tf
+    from tensorflow import keras
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Dropout
+
+    network = [numBranches] * (LAYER - 1) + [1]
+    numLayers = LAYER
+
+    # The features are float32 from the dataset cache on. With --bfloat16 the layers compute in bfloat16
+    # and keep float32 weights; the output layer stays float32 so the loss is computed in full precision.
+    policy = "mixed_bfloat16" if args.bfloat16 else "float32"
+
+    # Create a NN model. Barebones model with no layers.
+    model = Sequential()
+
+    # Best option for most NN.
+    opt = keras.optimizers.Nadam()
+    # opt = keras.optimizers.Adam()
+
+    # Activation function other options possible.
+    act = "relu"  # Relu is 0 for negative values, linear for nonzero values.
+
+    # Use model.add() to add one layer at a time, 1st layer needs input shape, So we pass the 1st element of network.
+    # Dense Layers are fully connected and most common.
+
+    model.add(Dense(network[0], input_dim=numBranches, dtype=policy))
+
+    # Loop through and add layers (1,(n-2)) where n is the number of layers. We end at n-2 because we start at 1 not zero and
+    # we  the input layer is added above with input dimension. Therefore we must remove 2 from layers.
+    for i in range(1, numLayers - 2):
+        model.add(Dense(network[i], activation=act, dtype=policy))  # Hidden layers.
+        # Turning off nuerons of layer above in loop with probability = 1-r, so r = 0.25, then 75% of nerouns are kept.
+        model.add(Dropout(RATE, seed=seed, dtype=policy))
+
+    # Last layer needs to have one neuron for a binary classification(BC) which yields from 0 to 1.
+    model.add(
+        Dense(network[-1], activation="sigmoid", dtype="float32")
+    )  # Output layer's activation function for BC needs to be sigmoid.
+
+    # Last step is compiling.
+    model.compile(
+        loss="binary_crossentropy",
+        optimizer=opt,
+        metrics=tf.keras.metrics.Precision(),
+    )
+    return model
+
+
+def epochTimer(timings):
+    """
+    Keras callback that records the seconds of every training epoch in timings, as fit.epoch001,
+    fit.epoch002, ...
+    """
+    from tensorflow import keras
+
+    class EpochTimer(keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            timings["fit.epoch%03d" % (epoch + 1)] = time.perf_counter() - self.start
+
+    return EpochTimer()
+
+
+def trainingData(batchSize):
+    """
+    Training and validation data of model.fit: streamed batches scaled on the fly (--stream), or
+    the scaled rows gathered in memory.
+
+    Without --stream X[train] and X[test] are copies of about 99% of the scaled X, made in every
+    process that trains (each multiNN.py worker holds its own), so the large phases need --stream
+    unless the memory fits the dataset once per worker.
+    """
+    if args.stream:
+        return dict(
+            x=featureStore.tfDataset(data, train, scaler, batchSize, args.buffer, seed),
+            validation_data=featureStore.tfDataset(data, test, scaler, batchSize),
+        )
+    return dict(
+        x=Xscaled[train],
+        y=y[train],
+        batch_size=batchSize,
+        validation_data=(Xscaled[test], y[test]),
+    )
 
-# Shuffle full data and split into train/test and validation set.
-X_dev, X_eval, y_dev, y_eval = train_test_split(
-    X, y, test_size=0.01, random_state=seed, stratify=y
-)
-X_train, X_test, y_train, y_test = train_test_split(
-    X_dev, y_dev, test_size=0.2, random_state=seed, stratify=y_dev
-)
 
 def main(LAYER, BATCH, RATE):
     """
@@ -119,6 +225,18 @@ def main(LAYER, BATCH, RATE):
     powers of 2 are perfered but any positive number works. RATE is the drop out rate; so a RATE = .5
     is half of the neurons being randomly turned off.
     """
+    import pandas as pd
+    import tensorflow as tf
+    import matplotlib.pyplot as plt
+    from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+    from sklearn.metrics import (
+        precision_recall_curve,
+        average_precision_score,
+        roc_curve,
+        auc,
+        confusion_matrix,
+    )
+
     network = []
     numEpochs =  150  # Number of times the NN gets trained.
     batchSize = BATCH
@@ -135,6 +253,7 @@ def main(LAYER, BATCH, RATE):
     print("Script starting....\n", network)
 
     # This tags the output files with either GPU or CPU.
+    status = len(tf.config.experimental.list_physical_devices("GPU"))
     if status == 1:
         print("GPU")
         sufix = ".GPU"
@@ -144,6 +263,7 @@ def main(LAYER, BATCH, RATE):
 
     # Start time for file name.
     startTime = datetime.now()
+    timings = dict(pipelineTimings)
     pre = time.strftime("%Y.%m.%d_") + time.strftime("%H.%M.%S.")
 
     # Filename for keras model to be saved as.
@@ -154,55 +274,19 @@ def main(LAYER, BATCH, RATE):
         + str(neurons)
         + ".batchSize"
         + str(BATCH)
+        + ".rate"
+        + str(RATE)
     )
     modelName = "data/" + pre + h5name + sufix + ".h5"
 
-    # NN model defined as a function.
-    def build_model():
-
-        # Create a NN model. Barebones model with no layers.
-        model = Sequential()
-
-        # Best option for most NN.
-        opt = keras.optimizers.Nadam()
-        # opt = keras.optimizers.Adam()
-
-        # Activation function other options possible.
-        act = "relu"  # Relu is 0 for negative values, linear for nonzero values.
-
-        # Use model.add() to add one layer at a time, 1st layer needs input shape, So we pass the 1st element of network.
-        # Dense Layers are fully connected and most common.
-
-        model.add(Dense(network[0], input_dim=numBranches))
-
-        # Loop through and add layers (1,(n-2)) where n is the number of layers. We end at n-2 because we start at 1 not zero and
-        # we  the input layer is added above with input dimension. Therefore we must remove 2 from layers.
-        for i in range(1, numLayers - 2):
-            model.add(Dense(network[i], activation=act))  # Hidden layers.
-            # Turning off nuerons of layer above in loop with probability = 1-r, so r = 0.25, then 75% of nerouns are kept.
-            model.add(Dropout(RATE, seed=seed))
-
-        # Last layer needs to have one neuron for a binary classification(BC) which yields from 0 to 1.
-        model.add(
-            Dense(network[-1], activation="sigmoid")
-        )  # Output layer's activation function for BC needs to be sigmoid.
-
-        # Last step is compiling.
-        model.compile(
-            loss="binary_crossentropy",
-            optimizer=opt,
-            metrics=tf.keras.metrics.Precision(),
-        )
-        return model
-
-    def compare_train_test(kModel, X_train, y_train, X_test, y_test, bins=30):
+    def compare_train_test(kModel, allScore, bins=30):
         """
         This creates the signal and background distrubution.
         """
         decisions = []
-        for X, y in ((X_train, y_train), (X_test, y_test)):
-            d1 = model.predict(X[y > 0.5]).ravel()  # signal
-            d2 = model.predict(X[y < 0.5]).ravel()  # background
+        for rows in (train, test):
+            d1 = allScore[rows][y[rows] > 0.5]  # signal
+            d2 = allScore[rows][y[rows] < 0.5]  # background
             decisions += [d1, d2]
         low = min(np.min(d) for d in decisions)
         high = max(np.max(d) for d in decisions)
@@ -246,10 +330,14 @@ def main(LAYER, BATCH, RATE):
         plt.show()
 
     # Using model and setting parameters.
-    model = build_model()
+    with slug.span(timings, "build"):
+        model = build_model(LAYER, RATE)
 
     # This checkpoint is used for recovery of trained weights incase of interuption.
-    checkPointsCallBack = ModelCheckpoint("temp.h5", save_best_only=True)
+    # One file per process, so trainings running in parallel do not overwrite each other. It is deleted
+    # once the model is saved.
+    checkPointFile = "temp.%d.h5" % os.getpid()
+    checkPointsCallBack = ModelCheckpoint(checkPointFile, save_best_only=True)
 
     # This terminates early if the monitor does not see an improvement after a certain
     # amount of epochs given by the patience.
@@ -257,42 +345,61 @@ def main(LAYER, BATCH, RATE):
         monitor="val_loss", patience=30, restore_best_weights=True
     )
 
+    # Training data: streamed batches scaled on the fly, or the scaled rows gathered in memory.
+    with slug.span(timings, "scale"):
+        trainData = trainingData(batchSize)
+
     # This is where the training starts.
-    kModel = model.fit(
-        X_train,
-        y_train,
-        epochs=numEpochs,
-        batch_size=batchSize,
-        validation_data=(X_test, y_test),
-        verbose=1,
-        callbacks=[earlyStopCallBack, checkPointsCallBack],
-    )
-    plt.subplot(211)
-    plt.plot(kModel.history['precision'])
-    plt.plot(kModel.history['val_precision'])
-    plt.title('model precision')
-    plt.ylabel('precision')
-    plt.xlabel('epoch')
-    plt.legend(['train', 'val'], loc='upper left')
-    plt.savefig('precision.jpg')
-    plt.subplot(212)
-    plt.plot(kModel.history['loss'])
-    plt.plot(kModel.history['val_loss'])
-    plt.title('model loss')
-    plt.ylabel('loss')
-    plt.xlabel('epoch')
-    plt.legend(['train', 'val'], loc='upper left')
-    plt.savefig('loss.jpg')
+    with slug.span(timings, "fit"):
+        kModel = model.fit(
+            epochs=numEpochs,
+            verbose=1,
+            callbacks=[earlyStopCallBack, checkPointsCallBack, epochTimer(timings)],
+            **trainData
+        )
+    del trainData
+    with slug.span(timings, "save"):
+        print("Saving model.....")
+        model.save(modelName)  # Save Model as a HDF5 filein Data folder
+        print("Model Saved")
+        # Scaler, branches, phase and number of jets saved next to the model, loaders apply them as they are.
+        slug.savePreprocessing(modelName, scaler, branches, phase, numofjets)
+        if os.path.exists(checkPointFile):
+            os.remove(checkPointFile)
+
+    # Score of every event, predicted once and stored with the dataset. Everything below slices it.
+    with slug.span(timings, "inference"):
+        allScore = featureStore.predictScores(model, modelName, data, scaler)
+    y_test = y[test]
+
+    with slug.span(timings, "plotting"):
+        plt.subplot(211)
+        plt.plot(kModel.history['precision'])
+        plt.plot(kModel.history['val_precision'])
+        plt.title('model precision')
+        plt.ylabel('precision')
+        plt.xlabel('epoch')
+        plt.legend(['train', 'val'], loc='upper left')
+        plt.savefig('precision.jpg')
+        plt.subplot(212)
+        plt.plot(kModel.history['loss'])
+        plt.plot(kModel.history['val_loss'])
+        plt.title('model loss')
+        plt.ylabel('loss')
+        plt.xlabel('epoch')
+        plt.legend(['train', 'val'], loc='upper left')
+        plt.savefig('loss.jpg')
     # This is the predicted score. Values range between [0,1]
-    y_predicted = model.predict(X_test)
+    y_predicted = allScore[test]
 
     # The score is rounded; values are 0 or 1.
-    y_predicted_round = [1 * (x[0] >= 0.5) for x in y_predicted]
+    y_predicted_round = [1 * (x >= 0.5) for x in y_predicted]
 
     # Prediction, fpr,tpr and threshold values for ROC.
-    fpr, tpr, thresholds = roc_curve(y_test, y_predicted)
-    aucroc = auc(fpr, tpr)
-    precision, recall, thresRecall = precision_recall_curve(y_test, y_predicted)
+    with slug.span(timings, "scan"):
+        fpr, tpr, thresholds = roc_curve(y_test, y_predicted)
+        aucroc = auc(fpr, tpr)
+        precision, recall, thresRecall = precision_recall_curve(y_test, y_predicted)
 
     # plt.xlabel("Score")
     # plt.ylabel("Distribution")
@@ -315,11 +422,15 @@ def main(LAYER, BATCH, RATE):
     # plot1 = plt.figure(1)
     # slug.plotROC(fpr, tpr, aucroc)
     # slug.plotPR(precision,recall,thresRecall)
-    # compare_train_test(kModel, X_train, y_train, X_test, y_test)
+    # compare_train_test(kModel, allScore)
 
     if False:
         # This plots the important features.
+        import shap
+
         plot2 = plt.figure(2)
+        X = featureStore.scaleDataset(data)
+        X_train, X_test = X[train], X[test]
         backgrounds = X_train[np.random.choice(X_train.shape[0], 100, replace=False)]
         explainer = shap.DeepExplainer(model, backgrounds)
         shap_values = explainer.shap_values(X_test)
@@ -332,63 +443,75 @@ def main(LAYER, BATCH, RATE):
         )
 
     # computes max signif
-    numbins = 1000000
-    allScore = model.predict(X)
-    sigScore = model.predict(X[y > 0.5]).ravel()
-    bkgScore = model.predict(X[y < 0.5]).ravel()
+    sigScore = allScore[:nsig]
+    bkgScore = allScore[nsig:]
     sigSUM = len(sigScore)
     bkgSUM = len(bkgScore)
 
-    xlimit = (0, 1)
-    tp = []
-    fp = []
-    hist, bins = np.histogram(sigScore, bins=numbins, range=xlimit, density=False)
-    count = 0
-    for i in range(numbins - 1, -1, -1):
-        count += hist[i] / sigSUM
-        tp.append(count)
-    hist, bins = np.histogram(bkgScore, bins=numbins, range=xlimit, density=False)
-    count = 0
-    for j in range(numbins - 1, -1, -1):
-        count += hist[j] / bkgSUM
-        fp.append(count)
-    area = auc(fp, tp)
-    xplot = tp
-    yplot = fp
-    # computes max signif
-    sigSUM = len(sigScore) * scalefactor
-    tp = np.array(tp) * sigSUM
-    fp = np.array(fp) * bkgSUM
-    syst = 0.0
-    stat = 0.0
-    maxsignif = 0.0
-    maxs = 0
-    maxb = 0
-    bincounter = numbins - 1
-    bincountatmaxsignif = 999
-    for t, f in zip(tp, fp):
-        signif = slug.getZPoisson(t, f, stat, syst)
-        if f >= 10 and signif > maxsignif:
-            maxsignif = signif
-            maxs = t
-            maxb = f
-            bincountatmaxsignif = bincounter
-            score = bincountatmaxsignif / numbins
-        bincounter -= 1
+    with slug.span(timings, "scan"):
+        # Signal events count scalefactor each and background events 1, unless --weighted.
+        if args.weighted:
+            sigWeights, bkgWeights = np.asarray(sigw), np.asarray(bkgw)
+        else:
+            sigWeights, bkgWeights = np.full(sigSUM, scalefactor), None
+        thresholds, tp, fp = slug.weightedYields(sigScore, bkgScore, sigWeights, bkgWeights)
+        xplot = np.append(0, tp / tp[-1])
+        yplot = np.append(0, fp / fp[-1])
+        area = auc(yplot, xplot)
+        # computes max signif
+        syst = 0.0
+        stat = 0.0
+        score, maxsignif, maxs, maxb = slug.maxSignificance(tp, fp, stat, syst, thresholds=thresholds)
     print(
         "\n Score = %6.3f\n Signif = %5.2f\n nsig = %d\n nbkg = %d\n"
         % (score, maxsignif, maxs, maxb)
     )
     runtime = datetime.now() - startTime
+    timings["total"] = runtime.total_seconds() + sum(pipelineTimings.values())
+    average_precision = average_precision_score(y_test, y_predicted)
+    tn, fp, fn, tp = confusion_matrix(y_test, y_predicted_round,normalize='all').ravel()
+    run = {
+        "model": modelName,
+        "dataset": data["key"],
+        "phase": phase,
+        "numofjets": numofjets,
+        "layers": LAYER,
+        "batch": BATCH,
+        "rate": RATE,
+        "epochs": len(kModel.history["loss"]),
+        "config": {
+            "stream": args.stream,
+            "weighted": args.weighted,
+            "device": sufix[1:],
+            "precision": "mixed_bfloat16" if args.bfloat16 else "float32",
+        },
+        "runtime": runtime.total_seconds(),
+        "peakrss": slug.peakMemory(),
+        "auc": aucroc,
+        "avgp": average_precision,
+        "score": score,
+        "signif": maxsignif,
+        "nsig": maxs,
+        "nbkg": maxb,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+    }
+    # One transaction per run, parallel trainings can record at the same time.
+    registry.recordRun(run, timings)
+    print("Time per phase (s), peak memory %.0f MB" % run["peakrss"])
+    for name, seconds in timings.items():
+        if not name.startswith("fit.epoch"):
+            print("   %-15s %10.2f" % (name, seconds))
+
     areaUnderCurve = "{:.4f}".format(aucroc)
     maxsignif = "{:5.2f}".format(maxsignif)
-    average_precision = average_precision_score(y_test, y_predicted)
     avgPer = "{0:0.4f}".format(average_precision)
     score = "{0:6.3f}".format(score)
     maxs = "%10d" % (maxs)
     maxb = "%10d" % (maxb)
     # cm = confusion_matrix(y_test, y_predicted_round)
-    tn, fp, fn, tp = confusion_matrix(y_test, y_predicted_round,normalize='all').ravel()
     CM = '[{0:0.2f}, {1:0.2f}, {2:0.2f}, {3:0.2f}]'.format(tp,fp,fn,tn)
     modelParam = [
         "FileName",
@@ -421,9 +544,10 @@ def main(LAYER, BATCH, RATE):
     )
     # df.to_csv("csv/testelep2.csv", mode="a", header=False, index=False)
     # df.to_csv("csv/highlevelvariables.csv", mode="a", header=False, index=False)
-    df.to_csv("csv/aug.csv", mode="a", header=False, index=False)
     print(df.to_string(justify="left", columns=modelParam, header=True, index=False))
-    print("Saving model.....")
-    model.save(modelName)  # Save Model as a HDF5 filein Data folder
-    print("Model Saved")
-main(5,512,0)
+    return df
+
+
+if __name__ == "__main__":
+    setup()
+    main(5,512,0)
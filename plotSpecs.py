@@ -0,0 +1,202 @@
+# Written By : Jonathan O. Tellechea
+# Adviser    : Mike Hance, Phd
+# Research   : Using a neural network to maximize the significance of tttHH production.
+# Description: Table of the 1D feature plots (feature, bin edges, axis label, unit scale) and the renderer of the PDF
+#              books of loadNN.py and sherpa_atlas.py. Every histogram of every sample is filled first, one bincount per
+#              feature over all the events, and the pages are then drawn from the bin contents, in parallel by a pool of
+#              worker processes when pypdf is installed to join their pages.
+###########################################################################################################################
+# Imported packages.
+import os
+import datetime
+import tempfile
+import collections
+import multiprocessing
+import numpy as np
+import slug
+
+# matplotlib is imported by the functions that draw, the table and histogramBook do not need it.
+
+# feature: branch name, edges: bin edges, label: x axis label, scale: factor the values are multiplied by
+# (e.g. 1e-3 for MeV to GeV), discrete: counted feature with one bin per value.
+PlotSpec = collections.namedtuple("PlotSpec", ["feature", "edges", "label", "scale", "discrete"])
+
+
+def countBins(low, high):
+    """
+    Unit bins centered on the integers low to high.
+    """
+    return np.arange(low, high + 1.5) - 0.5
+
+
+def evenBins(low, high, n):
+    """
+    n edges evenly spaced from low to high (n - 1 bins).
+    """
+    return np.linspace(low, high, n)
+
+
+# Every page of the books, in order.
+specs = [
+    PlotSpec("numjet", countBins(1, 21), "Jet multiplicity", 1.0, True),
+    PlotSpec("numlep", countBins(0, 3), "Lepton multiplicity", 1.0, True),
+    PlotSpec("btag", countBins(0, 10), "N b-tagged jets", 1.0, True),
+    PlotSpec("srap", evenBins(0, 10, 20), r"$ < \eta(b_{i},b_{j}) >$", 1.0, False),
+    PlotSpec("cent", evenBins(0, 1, 20), "Centrality", 1.0, False),
+    PlotSpec("m_bb", evenBins(0, 250, 25), r"${M}_{bb}$ [GeV]", 1.0, False),
+    PlotSpec("h_b", evenBins(0, 1500, 60), r"${H}_{B}$ [GeV]", 1.0, False),
+]
+specs += [PlotSpec("mt%d" % i, evenBins(0, 300, 100), r"${m}_{T}%d$ [GeV]" % i, 1.0, False) for i in range(1, 4)]
+specs += [PlotSpec("dr%d" % i, evenBins(0, 7, 100), r"$\Delta$R%d" % i, 1.0, False) for i in range(1, 4)]
+specs += [PlotSpec("jet%dbtag" % i, countBins(0, 1), "jet%dbtag" % i, 1.0, True) for i in range(1, 11)]
+# Transverse momenta are stored in MeV and plotted in GeV.
+specs += [PlotSpec("jet%dpT" % i, evenBins(0, 1000, 100), r"Jet%d pT [GeV]" % i, 1e-3, False) for i in range(1, 11)]
+specs += [PlotSpec("jet%deta" % i, evenBins(-6, 6, 12), r"Jet%d $\eta$" % i, 1.0, False) for i in range(1, 11)]
+specs += [PlotSpec("jet%dphi" % i, evenBins(-4, 4, 8), r"Jet%d $\phi$" % i, 1.0, False) for i in range(1, 11)]
+specs += [PlotSpec("lepton%dpT" % i, evenBins(0, 1000, 100), r"Lepton%d pT [GeV]" % i, 1e-3, False) for i in range(1, 3)]
+specs += [PlotSpec("lepton%deta" % i, evenBins(-6, 6, 12), r"Lepton%d $\eta$" % i, 1.0, False) for i in range(1, 3)]
+specs += [PlotSpec("lepton%dphi" % i, evenBins(-4, 4, 8), r"Lepton%d $\phi$" % i, 1.0, False) for i in range(1, 3)]
+
+
+def histogramBook(columns, selections, weights=None, pages=specs):
+    """
+    Histograms of every page for several selections of events.
+
+    columns: mapping feature -> values of every event (dict of arrays, data frame, ...); pages of
+             features that are not in it are skipped
+    selections: list of (category, ncategories), see slug.categoryHistograms; the histograms of
+                all the selections are stacked into the rows of one array
+    weights: weight of every event
+
+    Returns a dict feature -> array (rows, bins), in the order of pages.
+    """
+    histograms = {}
+    for spec in pages:
+        if spec.feature not in columns:
+            continue
+        values = np.asarray(columns[spec.feature])
+        if spec.scale != 1.0:
+            values = values * spec.scale
+        histograms[spec.feature] = np.vstack(
+            [slug.categoryHistograms(values, category, n, spec.edges, weights) for category, n in selections]
+        )
+    return histograms
+
+
+def drawPage(spec, counts, layers):
+    """
+    Draws one page from its bin contents.
+
+    layers: list of (rows, options); the rows of counts are drawn with plt.hist(**options),
+            stacked or side by side as the options say when there are several
+    """
+    import matplotlib.pyplot as plt
+
+    centers = (spec.edges[:-1] + spec.edges[1:]) / 2
+    # One entry per bin weighted by its content draws the filled histogram.
+    for rows, options in layers:
+        if len(rows) == 1:
+            plt.hist(centers, bins=spec.edges, weights=counts[rows[0]], **options)
+        else:
+            plt.hist([centers] * len(rows), bins=spec.edges, weights=[counts[row] for row in rows], **options)
+    if spec.discrete:
+        plt.xticks(spec.edges + 0.5)
+    plt.legend(loc=1, fontsize="x-small")
+    plt.xlabel(spec.label, horizontalalignment="right", x=1.0)
+    plt.ylabel("Events", horizontalalignment="right", y=1.0)
+    plt.title(r"$\sqrt{s}=$ 14 TeV, $\mathcal{L} =$ 3000 fb${}^{-1}$")
+    plt.yscale("log")
+
+
+def renderBook(pdf, histograms, layers, pages=specs):
+    """
+    Saves one page per histogram into a PdfPages, in the order of pages.
+
+    Every page is drawn in the classic style, whatever page it is and whatever process draws it.
+    """
+    import matplotlib.pyplot as plt
+
+    with plt.style.context("classic"):
+        for spec in pages:
+            if spec.feature not in histograms:
+                continue
+            drawPage(spec, histograms[spec.feature], layers)
+            pdf.savefig()  # saves the current figure into a pdf page
+            plt.close()
+
+
+def renderChunk(task):
+    """
+    Renders consecutive pages of a book into their own PDF file in a worker process.
+
+    task: (filename, pages, histograms, layers)
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    filename, pages, histograms, layers = task
+    # Pages are only saved to the file, never shown.
+    plt.switch_backend("Agg")
+    with PdfPages(filename) as pdf:
+        renderBook(pdf, histograms, layers, pages)
+    return filename
+
+
+def pdfDate(value):
+    """
+    Date of the PDF metadata (D:YYYYMMDDHHmmSS), other values are kept.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.strftime("D:%Y%m%d%H%M%S")
+    return value
+
+
+def writeBook(pdfname, histograms, layers, metadata, pages=specs, workers=None):
+    """
+    Writes one page per histogram into pdfname, in the order of pages, with the metadata of
+    PdfPages.infodict (Title, Author, Subject, Keywords, CreationDate, ModDate).
+
+    The pages are split into one run of consecutive pages per worker process (all cores by default)
+    and joined with pypdf. Without pypdf, or with workers=1, they are rendered one after the other.
+    The workers are spawned (fresh processes that import the calling script), so scripts calling
+    writeBook keep their work under if __name__ == "__main__".
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    pages = [spec for spec in pages if spec.feature in histograms]
+    if workers is None:
+        workers = os.cpu_count()
+    workers = max(1, min(workers, len(pages)))
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        if workers > 1:
+            print("pypdf is not installed, the %d pages of %s are rendered serially" % (len(pages), pdfname))
+        workers = 1
+
+    if workers == 1:
+        with PdfPages(pdfname) as pdf:
+            renderBook(pdf, histograms, layers, pages)
+            pdf.infodict().update(metadata)
+        return pdfname
+
+    chunks = np.array_split(np.arange(len(pages)), workers)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(pdfname))) as tmpdir:
+        tasks = []
+        for i, chunk in enumerate(chunks):
+            chunkPages = [pages[j] for j in chunk]
+            chunkHistograms = {spec.feature: histograms[spec.feature] for spec in chunkPages}
+            tasks.append((os.path.join(tmpdir, "pages%03d.pdf" % i), chunkPages, chunkHistograms, layers))
+        # Not forked: the caller may already run tensorflow (loadNN.py loads its model to predict the
+        # scores), whose threads and locks a forked child would inherit.
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            parts = pool.map(renderChunk, tasks)
+
+        writer = PdfWriter()
+        for part in parts:
+            for page in PdfReader(part).pages:
+                writer.add_page(page)
+        writer.add_metadata({"/" + key: pdfDate(value) for key, value in metadata.items()})
+        with open(pdfname, "wb") as output:
+            writer.write(output)
+    return pdfname
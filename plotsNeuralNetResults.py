@@ -1,8 +1,18 @@
-import pandas as pd
 import numpy as np
-import tkinter as tk
-import matplotlib
-matplotlib.use('TkAgg')
+import argparse
+import registry  # Record of the trained NN.
+import slug
+
+parser = argparse.ArgumentParser(description="Metrics of the best NN of each length, from the registry")
+parser.add_argument("--db", default=registry.registryFile, help="registry database")
+parser.add_argument("--batch", action="store_true", help="headless batch job: the plots are saved, not shown")
+parser.add_argument(
+    "--output", default="plotsNeuralNetResults", help="batch mode: plots saved as <output>1.png, <output>2.png, ..."
+)
+args = parser.parse_args()
+slug.batchBackend(args.batch)
+
+# Imported once the options are parsed and the backend is chosen, so --help answers at once.
 import matplotlib.pyplot as plt
 # file = 'hyperparameterRecord_v3.csv'
 # file = 'fiveLayerDropout.csv'
@@ -11,19 +21,27 @@ import matplotlib.pyplot as plt
 
 # modelParam  = ['NN Archi.','#Br.','LR','Batch','AUC','Avg.P','Y/M/D @ H:M','ConfusionMatrix [TP FP] [FN TN]','Score','Max Signif','nsig','nbkg']
 # modelParam  = ['NN Archi.','#Br.','LR','Batch','AUC','Avg.P','Run Time','ConfusionMatrix [TP FP] [FN TN]','Score','Max Signif','nsig','nbkg']
-file = 'csv/tenlayers.csv'
+# file = 'csv/tenlayers.csv'
 modelParam = [
-        'FileName',
-        "ConfusionMatrix [TP FP] [FN TN]",
-        "Run Time",
-        "AUC",
-        "Avg.P",
-        "Score",
-        "Max Signif",
-        "nsig",
-        "nbkg"
+        'model',
+        'layers',
+        'runtime',
+        'auc',
+        'avgp',
+        'score',
+        'signif',
+        'nsig',
+        'nbkg'
     ]
-data = pd.read_csv(file)
+# Best run of the registry for each length of the NN, one curve per feature set (phase).
+data = registry.queryRuns(args.db, orderBy='signif')
+phases = {3: ('All', 'k-'), 2: ('low lvl', 'b-'), 1: ('high lvl', 'r-')}
+# Runs without a phase (old records of a feature list slug.dataCol no longer gives) get one curve per number of
+# features, read from the model name.
+features = data['model'].str.extract(r'numBranches(\d+)', expand=False).fillna('?') + ' features'
+data['curve'] = data['phase'].where(data['phase'].isin(list(phases)), features)
+phases.update({curve: (curve, '.--') for curve in data['curve'] if curve not in phases})
+data = data.drop_duplicates(['curve', 'layers']).sort_values('layers')
 
 # print(data.to_string(justify='left',columns=modelParam,header=True,index=False))
 
@@ -144,12 +162,9 @@ data = pd.read_csv(file)
 #     x.append(i+3)
 #     x.append(i+3) 
 # x = np.array(x)
-x = range(1,10)
-auc  = data['AUC']
-maxs = data['Max Signif']
-avgp = data['Avg.P']
-score = data['Score']
-runtime = []
+# Run time is stored in seconds.
+data['minutes'] = data['runtime'] / 60
+runs = {phase: data[data['curve'] == phase] for phase in phases if (data['curve'] == phase).any()}
 # for i in range(0,index):
 #     hh = int(data['Run Time'][:index][i][7:9])
 #     mm = int(data['Run Time'][:index][i][10:12])
@@ -172,11 +187,10 @@ fig1 = plt.figure(1)
 # plt.plot(x,auc,'b.', label = 'AUC')
 # plt.plot(x,maxs,'g-', label = 'Max Signif')
 plt.title('Avg Precision')
-plt.plot(x,avgp[:9],'k-', label = 'All')
-# plt.plot(x,avgp[19:38],'b-', label = 'low lvl')
-plt.plot(x,avgp[9:],'r-', label = 'high lvl')
+for phase, run in runs.items():
+    plt.plot(run['layers'],run['avgp'],phases[phase][1], label = phases[phase][0])
 # plt.plot(x,avgp,'r-', label = 'Avg Precision')
-plt.xticks(np.arange(1, 10, 1))
+plt.xticks(np.arange(data['layers'].min(), data['layers'].max() + 1, 1))
 plt.ylim(0.4,1)
 # ax1.set_ylim(0.7,1)
 # plt.plot(x,score,'y.', label = 'Score')
@@ -190,10 +204,9 @@ fig2 = plt.figure(2)
 # ax2 = fig1.add_subplot(2, 2, 2)
 # plt.plot(x,auc,'b.', label = 'AUC')
 plt.title('Max Signif')
-plt.plot(x,maxs[:9],'k-', label = 'All')
-# plt.plot(x,maxs[19:38],'b-', label = 'low lvl')
-plt.plot(x,maxs[9:],'r-', label = 'high lvl')
-plt.xticks(np.arange(1, 10, 1))
+for phase, run in runs.items():
+    plt.plot(run['layers'],run['signif'],phases[phase][1], label = phases[phase][0])
+plt.xticks(np.arange(data['layers'].min(), data['layers'].max() + 1, 1))
 plt.ylim(0,6)
 # plt.plot(x,avgp,'r.', label = 'Avg Precision')
 # # plt.plot(x,score,'y.', label = 'Score')
@@ -216,10 +229,9 @@ plt.grid()
 fig3 = plt.figure(3)
 # ax3 = fig1.add_subplot(2, 2, 3)
 plt.title('AUC')
-plt.plot(x,auc[:9],'k-', label = 'All')
-# plt.plot(x,auc[19:38],'b-', label = 'low lvl')
-plt.plot(x,auc[9:],'r-', label = 'high lvl')
-plt.xticks(np.arange(1, 10, 1))
+for phase, run in runs.items():
+    plt.plot(run['layers'],run['auc'],phases[phase][1], label = phases[phase][0])
+plt.xticks(np.arange(data['layers'].min(), data['layers'].max() + 1, 1))
 plt.ylim(0.4,1)
 # plt.plot(x,maxs,'g-', label = 'Max Signif')
 # plt.plot(x,avgp,'r.', label = 'Avg Precision')
@@ -230,14 +242,15 @@ plt.legend(loc = 'lower right')
 plt.grid()
 # plt.show()
 
-# # plt.plot(x,auc,'b-', label = 'AUC')
-# plt.plot(x,runtime,'k.', label = 'Run Time')
-# # plt.plot(x,avgp,'r-', label = 'Avg Precision')
-# # plt.plot(x,score,'y-', label = 'Score')
-# plt.xlabel('Length of Neural Network')
-# plt.ylabel('Minutes')
-# plt.title('Run Time vs. Number of Layers')
-# plt.legend(loc = 'upper left')
-# # plt.grid()
+fig4 = plt.figure(4)
+plt.title('Run Time vs. Number of Layers')
+for phase, run in runs.items():
+    plt.plot(run['layers'],run['minutes'],phases[phase][1], label = phases[phase][0])
+plt.xticks(np.arange(data['layers'].min(), data['layers'].max() + 1, 1))
+plt.xlabel('Length of Neural Network')
+plt.ylabel('Minutes')
+plt.legend(loc = 'upper left')
+plt.grid()
 # # fig1.text(.5, .05, txt, ha='center')
-plt.show()
\ No newline at end of file
+for filename in slug.showFigures(args.batch, args.output):
+    print(filename)
@@ -0,0 +1,269 @@
+# Written By : Jonathan O. Tellechea
+# Adviser    : Mike Hance, Phd
+# Research   : Using a neural network to maximize the significance of tttHH production.
+# Description: Registry of the trained NN. Every run of nnKerasGPU.py is one row of an SQLite database with typed columns
+#              (configuration, run time, peak memory, AUC, significance, model file and dataset fingerprint) and its time
+#              spent in each phase. Every run is written in one transaction, so parallel sweeps log safely, and the metrics are indexed
+#              so thousands of runs are ranked at once.
+###########################################################################################################################
+# Imported packages.
+import os
+import re
+import json
+import time
+import sqlite3
+import numpy as np
+import slug
+
+# Database every run is recorded in.
+registryFile = "csv/runs.sqlite"
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    created   TEXT NOT NULL,
+    model     TEXT,
+    dataset   TEXT,
+    phase     INTEGER,
+    numofjets INTEGER,
+    layers    INTEGER,
+    batch     INTEGER,
+    rate      REAL,
+    epochs    INTEGER,
+    config    TEXT,
+    runtime   REAL,
+    peakrss   REAL,
+    auc       REAL,
+    avgp      REAL,
+    score     REAL,
+    signif    REAL,
+    nsig      REAL,
+    nbkg      REAL,
+    tp        REAL,
+    fp        REAL,
+    fn        REAL,
+    tn        REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run     INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    span    TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run, span)
+);
+CREATE INDEX IF NOT EXISTS runs_signif ON runs(signif);
+CREATE INDEX IF NOT EXISTS runs_auc ON runs(auc);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs(dataset, signif);
+CREATE INDEX IF NOT EXISTS runs_config ON runs(layers, batch, rate);
+"""
+
+# Columns added after the first version of the registry, with their type.
+addedColumns = {"peakrss": "REAL"}
+
+# Columns of a run, besides its id.
+columns = [
+    "created",
+    "model",
+    "dataset",
+    "phase",
+    "numofjets",
+    "layers",
+    "batch",
+    "rate",
+    "epochs",
+    "config",
+    "runtime",
+    "peakrss",
+    "auc",
+    "avgp",
+    "score",
+    "signif",
+    "nsig",
+    "nbkg",
+    "tp",
+    "fp",
+    "fn",
+    "tn",
+]
+
+
+def connect(path=registryFile):
+    """
+    Connection to the registry, created with its tables and indexes the first time.
+
+    The database is in WAL mode: readers never block the runs being written, and writers wait for
+    each other up to a minute.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    con = sqlite3.connect(path, timeout=60)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA foreign_keys=ON")
+    con.executescript(schema)
+    # Registries written before a column was added get it, empty for their old runs.
+    existing = set(row[1] for row in con.execute("PRAGMA table_info(runs)"))
+    for column, kind in addedColumns.items():
+        if column not in existing:
+            try:
+                con.execute("ALTER TABLE runs ADD COLUMN %s %s" % (column, kind))
+            except sqlite3.OperationalError as error:
+                # Another connection opened at the same time added it first.
+                if "duplicate column" not in str(error):
+                    raise
+    return con
+
+
+def sqlValue(value):
+    """
+    Value as sqlite stores it: numpy scalars as python numbers, dicts and lists as json.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value)
+    return value
+
+
+def recordRun(run, timings=None, path=registryFile):
+    """
+    Adds a run to the registry.
+
+    run: dict of columns (see columns), 'created' is now by default and 'config' may be a dict of
+         other settings
+    timings: dict of seconds spent in each span of the run (e.g. {'load': 12.0, 'fit': 600.0})
+
+    The run and its timings are written in a single transaction. Returns the id of the run.
+    """
+    run = dict(run)
+    run.setdefault("created", time.strftime("%Y-%m-%d %H:%M:%S"))
+    unknown = set(run) - set(columns)
+    if unknown:
+        raise ValueError("unknown registry columns: %s" % ", ".join(sorted(unknown)))
+
+    con = connect(path)
+    try:
+        with con:
+            cursor = con.execute(
+                "INSERT INTO runs (%s) VALUES (%s)" % (", ".join(run), ", ".join("?" * len(run))),
+                [sqlValue(value) for value in run.values()],
+            )
+            con.executemany(
+                "INSERT INTO timings (run, span, seconds) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, span, float(seconds)) for span, seconds in (timings or {}).items()],
+            )
+        return cursor.lastrowid
+    finally:
+        con.close()
+
+
+def queryRuns(path=registryFile, orderBy="signif", descending=True, limit=None, where=None, params=()):
+    """
+    Runs of the registry as a data frame, best first by default.
+
+    orderBy: column the runs are sorted by (signif, auc, runtime, id, ...)
+    where: sql condition on the columns, e.g. "phase = ? AND layers > 4" with params (3,)
+    """
+    import pandas as pd
+
+    if orderBy not in columns + ["id"]:
+        raise ValueError("unknown registry column: %s" % orderBy)
+    sql = "SELECT * FROM runs"
+    if where:
+        sql += " WHERE " + where
+    sql += " ORDER BY %s %s" % (orderBy, "DESC" if descending else "ASC")
+    if limit:
+        sql += " LIMIT %d" % limit
+    con = connect(path)
+    try:
+        return pd.read_sql_query(sql, con, params=params, index_col="id")
+    finally:
+        con.close()
+
+
+def queryTimings(path=registryFile):
+    """
+    Seconds spent in each span of every run, one row per run and one column per span.
+    """
+    import pandas as pd
+
+    con = connect(path)
+    try:
+        timings = pd.read_sql_query("SELECT run, span, seconds FROM timings", con)
+    finally:
+        con.close()
+    return timings.pivot(index="run", columns="span", values="seconds")
+
+
+def featureSets(maxjets=21):
+    """
+    Phase and number of jets of each number of features (numBranches of the model names), from
+    slug.dataCol. The high level variables do not depend on the jets, their number of jets is None.
+    """
+    sets = {}
+    for phase in (1, 2, 3):
+        for numofjets in range(maxjets + 1):
+            numBranches = len(slug.dataCol(phase, numofjets)) - 2
+            sets.setdefault(numBranches, (phase, None if phase == 1 else numofjets))
+    return sets
+
+
+def importCsv(csvfile, path=registryFile):
+    """
+    Adds the runs of an old record csv (FileName, ConfusionMatrix, Run Time, AUC, ... as written by
+    nnKerasGPU.py before the registry) in one transaction. The configuration is read from the model
+    file names; the phase and number of jets from their number of features (see featureSets), they
+    stay empty when it is not one slug.dataCol gives.
+
+    Returns the number of runs added.
+    """
+    import pandas as pd
+
+    record = pd.read_csv(csvfile)
+    sets = featureSets()
+    runs = []
+    for _, row in record.iterrows():
+        name = str(row["FileName"])
+        # Model files start with the date they were trained, e.g. 2021.01.31_12.00.00.numLayers5...
+        date = re.match(r"(\d{4})\.(\d\d)\.(\d\d)_(\d\d)\.(\d\d)\.(\d\d)", name)
+        layers = re.search(r"numLayers(\d+)", name)
+        batch = re.search(r"batchSize(\d+)", name)
+        rate = re.search(r"rate([\d.]+?)\.[GC]PU", name)
+        numBranches = re.search(r"numBranches(\d+)", name)
+        phase, numofjets = sets.get(int(numBranches.group(1)), (None, None)) if numBranches else (None, None)
+        # Written as [TP, FP, FN, TN] or ([TP, FP], [FN, TN]).
+        tp, fp, fn, tn = map(float, re.findall(r"[-+\d.eE]+", row["ConfusionMatrix [TP FP] [FN TN]"]))
+        runs.append(
+            {
+                "created": "%s-%s-%s %s:%s:%s" % date.groups() if date else time.strftime("%Y-%m-%d %H:%M:%S"),
+                "model": "data/" + name,
+                "phase": phase,
+                "numofjets": numofjets,
+                "layers": int(layers.group(1)) if layers else None,
+                "batch": int(batch.group(1)) if batch else None,
+                "rate": float(rate.group(1)) if rate else None,
+                "runtime": pd.to_timedelta(row["Run Time"]).total_seconds(),
+                "auc": float(row["AUC"]),
+                "avgp": float(row["Avg.P"]),
+                "score": float(row["Score"]),
+                "signif": float(row["Max Signif"]),
+                "nsig": float(row["nsig"]),
+                "nbkg": float(row["nbkg"]),
+                "tp": tp,
+                "fp": fp,
+                "fn": fn,
+                "tn": tn,
+            }
+        )
+
+    if not runs:
+        return 0
+    con = connect(path)
+    try:
+        with con:
+            con.executemany(
+                "INSERT INTO runs (%s) VALUES (%s)" % (", ".join(runs[0]), ", ".join("?" * len(runs[0]))),
+                [list(run.values()) for run in runs],
+            )
+    finally:
+        con.close()
+    return len(runs)
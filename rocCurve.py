@@ -14,11 +14,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.metrics import auc
 from numpy import array
+import slug
 
 ### parser -START
 parser = argparse.ArgumentParser(description= 'sigf of BDT/NN/DN')
 parser.add_argument("--file", type=str, help= "Use '--file=' followed by a *.csv file")
-parser.add_argument("--syst", action='store', default=0.0)
+parser.add_argument("--syst", type=float, nargs='+', default=[0.0], help= "Relative syst uncertainties on background, one scan each")
 args = parser.parse_args()
 file = str(args.file)
 df = pd.read_csv(file)
@@ -45,77 +46,22 @@ nBG=((3332932/5900000.)*5.85e6) + ((320752/610000.)*612000.) + ((158645/270000.)
 
 
 
-def getZPoisson(s, b, stat, syst):
-    """
-    The significance for optimisation.
-
-    s: total number of signal events
-    b: total number of background events
-    stat: relative MC stat uncertainty for the total bkg. 
-    syst: relative syst uncertainty on background
-
-    Note that the function already accounts for the sqrt(b) 
-    uncertainty from the data, so we only need to pass in additional
-    stat and syst terms.  e.g. the stat term above is really only
-    characterizing the uncertainty due to limited MC statistics used
-    to estimate the background yield.
-    """
-    n = s+b
-
-    # this is a relative uncertainty
-    sigma = math.sqrt(stat**2+syst**2)
-
-    # turn into the total uncertainty
-    sigma=sigma*b
-
-    if s <= 0 or b <= 0:
-        return 0
-
-    factor1=0
-    factor2=0
-    
-    if (sigma < 0.01):
-        #In the limit where the total BG uncertainty is zero, 
-        #this reduces to approximately s/sqrt(b)
-        factor1 = n*log((n/b))
-        factor2 = (n-b)
-    else:
-        factor1 = n*log( (n*(b+sigma**2))/((b**2)+n*sigma**2) )
-        factor2 = ((b**2)/(sigma**2))*log( 1 + ((sigma**2)*(n-b))/(b*(b+sigma**2)) )
-    
-    signif=0
-    try:
-        signif=math.sqrt( 2 * (factor1 - factor2))
-    except ValueError:
-        signif=0
-        
-    return signif
-
-
 scanROC=True
 if scanROC:
     
-    signifs=np.array([])
-    signifs2={}
-    syst=float(args.syst)
+    systs=np.array(args.syst)
     stat=0.0
-    maxsignif=0.0
-    maxbdt=2
-    maxs=0
-    maxb=0
-    for f,t,bdtscore in zip(fpr,tpr,thresholds):
-        s=nSig*t
-        b=nBG*f
-        n=s+b
-        signif = getZPoisson(s,b,stat,syst)
-        np.append(signifs,signif)
-        signifs2[f]=signif
-        if signif>maxsignif:
-            maxsignif=signif
-            maxbdt=bdtscore
-            maxs=s
-            maxb=b
-    print(" Score = %6.7f\n Sign. = %4.2f\n nsig. = %d\n nbkg. = %d" % (maxbdt,maxsignif,maxs,maxb))
+    # One significance curve per syst, in one call.
+    signifs = slug.getZPoisson(nSig*tpr, nBG*fpr, stat, systs[:,None])
+    for syst,signif in zip(systs,signifs):
+        best = int(np.argmax(signif))
+        maxsignif=signif[best]
+        maxbdt=thresholds[best]
+        maxs=nSig*tpr[best]
+        maxb=nBG*fpr[best]
+        if maxsignif<=0:
+            maxsignif,maxbdt,maxs,maxb = 0.0,2,0,0
+        print(" Syst. = %4.2f\n Score = %6.7f\n Sign. = %4.2f\n nsig. = %d\n nbkg. = %d" % (syst,maxbdt,maxsignif,maxs,maxb))
 
 drawPlots=True
 if drawPlots:
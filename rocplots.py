@@ -4,28 +4,37 @@
 # Description: Script that creates a ROC plot for Low, High, and Low + High VARS (Background rejection vs signal efficiency).
 ##############################################################################################################################
 # Imported packages.
-import pandas as pd
-import tkinter as tk
-import matplotlib
+import argparse
+import slug
+
+parser = argparse.ArgumentParser(description="ROC of the three feature sets, from the csv files of rocs.py")
+parser.add_argument("--all", default="csv/highandlowlvlvars.csv", help="ROC of the High and Low level NN (phase 3)")
+parser.add_argument("--low", default="csv/lowlvlvars.csv", help="ROC of the Low level NN (phase 2)")
+parser.add_argument("--high", default="csv/highlvlvars.csv", help="ROC of the High level NN (phase 1)")
+parser.add_argument("--batch", action="store_true", help="headless batch job: the plots are saved, not shown")
+parser.add_argument("--output", default="rocplots", help="batch mode: plots saved as <output>1.png, <output>2.png")
+args = parser.parse_args()
+slug.batchBackend(args.batch)
 
-matplotlib.use("TkAgg")
+# Imported once the options are parsed and the backend is chosen, so --help answers at once.
+import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.metrics import auc
 
 # Load High and Low level csv file created by rocs.py script.
-hnlv = pd.read_csv("csv/highandlowlvlvars.csv")
+hnlv = pd.read_csv(args.all)
 f_hnlv = hnlv["fpr"]
 t_hnlv = hnlv["tpr"]
 bkgR_hnlv = hnlv["bkgR"]
 
 # Load Low level VARS csv file created by rocs.py script.
-llv = pd.read_csv("csv/lowlvlvars.csv")
+llv = pd.read_csv(args.low)
 f_llv = llv["fpr"]
 t_llv = llv["tpr"]
 bkgR_llv = llv["bkgR"]
 
 # Load High Level VARS csv file created by rocs.py script.
-hlv = pd.read_csv("csv/highlvlvars.csv")
+hlv = pd.read_csv(args.high)
 f_hlv = hlv["fpr"]
 t_hlv = hlv["tpr"]
 bkgR_hlv = hlv["bkgR"]
@@ -56,4 +65,5 @@ plt.xlabel("False Positive Rate")
 plt.grid()
 plt.title("Receiver operating characteristic")
 plt.legend(loc="lower right")
-plt.show()
+for filename in slug.showFigures(args.batch, args.output):
+    print(filename)
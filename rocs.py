@@ -4,27 +4,9 @@
 # Description: Creates a csv file for ROC plots from h5 file, to then be used by rocplots.py.
 ###########################################################################################################################
 # Import packages.
-import sys
-import uproot
 import argparse
-import numpy as np
-import pandas as pd
-import tensorflow as tf
-from tensorflow import keras
-import tkinter as tk
-import matplotlib
 import slug
-
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from numpy import array
-from tensorflow.keras.models import load_model
-from sklearn.utils import shuffle
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import auc, roc_curve
-
-sc = StandardScaler()
+import featureStore
 
 # Fixed values.
 seed = 42
@@ -35,106 +17,73 @@ parser = argparse.ArgumentParser(
     description="Imports weights from trained NN, files located in data/"
 )
 parser.add_argument("--file", type=str, help="Use '--file' followed by a *.h5 file")
+parser.add_argument(
+    "--phase",
+    type=int,
+    default=None,
+    choices=[1, 2, 3],
+    help="1 for High, 2 for Low, or 3 for both, models saved without preprocessing",
+)
+parser.add_argument(
+    "--output",
+    default=None,
+    help="csv file (default: highlvlvars.csv, lowlvlvars.csv or highandlowlvlvars.csv by phase)",
+)
+parser.add_argument(
+    "--format",
+    default="root",
+    choices=["root", "parquet", "feather"],
+    help="format of the flattened samples (see columnarFlatten.py --format)",
+)
 args = parser.parse_args()
 file = "data/" + str(args.file)
 
-# Branches names of high/low level variables aka: features.
-HighLevel = [
-    "numjet",
-    "numlep",
-    "btag",
-    "srap",
-    "cent",
-    "m_bb",
-    "h_b",
-    "mt1",
-    "mt2",
-    "mt3",
-    "dr1",
-    "dr2",
-    "dr3",
-]
-type = ["flav", "pT", "eta", "phi", "b", "c"]
-LeptonVAR = []
-JetVAR = []
-for i in range(4):
-    for j in range(3):
-        LeptonVAR.append("lepton" + str(j + 1) + type[i])
-for i in range(1, 6):
-    for j in range(10):
-        JetVAR.append("jet" + str(j + 1) + type[i])
-
-# Auto select feature set.
-phase = int(input("Enter 1 for High, 2 for Low, or 3 for both:"))
-
-if phase == 1:
-    branches = sorted(HighLevel) + ["weights", "truth"]
-elif phase == 2:
-    branches = sorted(LeptonVAR + JetVAR) + ["weights", "truth"]
-elif phase == 3:
-    branches = sorted(HighLevel + JetVAR + LeptonVAR) + ["weights", "truth"]
-else:
-    print("Invalid option")
-    sys.exit()
-
+# Imported once the options are parsed, so --help answers at once.
+import pandas as pd
+from sklearn.metrics import roc_curve
+
+# Scaler, branches and phase the model was trained with.
+prep = slug.loadPreprocessing(file)
+if prep is None:
+    # Models saved without them need the feature set on the command line.
+    if args.phase is None:
+        parser.error("%s was saved without its preprocessing, give its --phase" % file)
+    prep = slug.loadPreprocessing(file, args.phase, 10)
+
+phase = prep["phase"]
+branches = prep["branches"]
 numBranches = len(branches) - 2
 
-# Data read from file.
-signal = uproot.open("data/new_TTHH.root")[tree]
-df_signal = signal.pandas.df(branches)
-
-bkgTTBB = uproot.open("data/new_TTBB.root")[tree]
-df_bkgTTBB = bkgTTBB.pandas.df(branches)
-
-bkgTTH = uproot.open("data/new_TTH.root")[tree]
-df_bkgTTH = bkgTTH.pandas.df(branches)
-
-bkgTTZ = uproot.open("data/new_TTZ.root")[tree]
-df_bkgTTZ = bkgTTZ.pandas.df(branches)
-
-df_background = pd.concat([df_bkgTTBB, df_bkgTTH, df_bkgTTZ])
-
-shuffleBackground = shuffle(df_background, random_state=seed)
-
-
-# signal and limited shuffle background data to counter inbalanced data problem.
-rawdata = pd.concat([df_signal, shuffleBackground])
-
-# Drops weights column from rawdata.
-X = rawdata.drop("weights", axis=1)
-
-# Transforms X to have a mean = 0 and a variance = 1.
-X = sc.fit_transform(X)
+# Signal and shuffled backgrounds, read from the feature store cache after the first run.
+data = featureStore.loadDataset(
+    "data/", phase, prep["numofjets"], seed, extension="." + args.format, branches=branches
+)
+nsig = data["nsig"]
 
 # Weights of data applied to scale events.
 scalefactor = 0.00232 * 0.608791
-sigw = rawdata["weights"][: len(signal)] * scalefactor
-bkgw = rawdata["weights"][len(signal) :]
+sigw = data["weights"][:nsig] * scalefactor
+bkgw = data["weights"][nsig:]
 
 # Labeling data with 1's and 0's to distinguish.
-y = np.concatenate((np.ones(len(signal)), np.zeros(len(shuffleBackground))))
+y = data["y"]
 
 
-neuralNet = keras.models.load_model(file)
-
-y_predicted = neuralNet.predict(X)
+# Scores of the model, scaled with the saved scaler and cached with the dataset.
+y_predicted = featureStore.predictScores(None, file, data, prep["scaler"])
 
 # False postive rate, true positive rate and threshold from trained NN model.
 fpr, tpr, thresholds = roc_curve(y, y_predicted)
 
 flag2 = 1
 if flag2 == 1:
-    numbins = 100000
-    data = {"fpr": fpr, "tpr": tpr, "bkgR": 1 / fpr}
-    df = pd.DataFrame(data)
-
-    # Auto save, Phase intialized in line 30.
-    if phase == 1:
-        df.to_csv("highlvlvars.csv", mode="a", header=True, index=False)
-    elif phase == 2:
-        df.to_csv("lowlvlvars.csv", mode="a", header=True, index=False)
-    elif phase == 3:
-        df.to_csv("highandlowlvlvars.csv", mode="a", header=True, index=False)
+    df = pd.DataFrame({"fpr": fpr, "tpr": tpr, "bkgR": 1 / fpr})
+
+    # Auto save, named after the phase unless --output is given.
+    outputs = {1: "highlvlvars.csv", 2: "lowlvlvars.csv", 3: "highandlowlvlvars.csv"}
+    output = args.output or outputs[phase]
+    df.to_csv(output, mode="a", header=True, index=False)
+    print(output)
 
 """ This code is here until we determine if it is still needed."""
 
@@ -16,7 +16,6 @@ import itertools
 seed = 42
 random.seed(seed)
 import ROOT
-rand = random.random()
 
 
 def augment_rootfile(filepath):
@@ -174,7 +173,8 @@ def augment_rootfile(filepath):
             sum = (jetvec[tracker_btj[x]] + jetvec[tracker_btj[y]]).M()
         return sum
 
-    def btaggedjet(truebhadron,truechadron):
+    # rand is drawn once per jet, so every jet gets its own tagging decision.
+    def btaggedjet(truebhadron, truechadron, rand):
         # 70% of truth-b-jets are labeled as b-tagged
         if truebhadron == 1 and rand <= 0.7:
             return 1
@@ -193,6 +193,9 @@ def augment_rootfile(filepath):
 
     ### Fucnctions END ###
 
+    # Pairings (o,j),(k,l) of the first six b-tagged jets for the chisquare, o < j < k < l.
+    pairings = list(itertools.combinations(range(6), 4))
+
     # Number of events.
     n_entries = tree.GetEntries()
 
@@ -212,9 +215,9 @@ def augment_rootfile(filepath):
         chisq = []  # Chi Square list.
         lepvec = {}  # Lepton ROOT Four Vector.
         jetvec = {}  # Jet ROOT Four Vector.
+        jettag = {}  # Jet b-tag decision.
         neutrino = {}  # Neutrino ROOT Fpur Vector.
         HB_sum_Pt = 0.0  # Initialize sum of Pt for all b-tag jets.
-        # rand = 0.0  # Initialize rand value.
         cen_sum_Pt = 0.0  # Initialize sum of Pt for all jets.
         cen_sum_E = 0.0  # Initialize sum of E for all jets.
         etasum = 0.0  # Initialize sum for eta seperation.
@@ -305,16 +308,11 @@ def augment_rootfile(filepath):
             # Scalar sum of Pt.
             cen_sum_Pt += jetvec[x].Pt()
 
-            # 70% of truth-b-jets are labeled as b-tagged
-            if event.jetbhadron[x] == 1 and rand <= 0.7:
-                tracker_btj.append(x)
-
-            # 20% mistag rate for c-jets.
-            elif event.jetchadron[x] == 1 and rand <= 0.2:
-                tracker_btj.append(x)
-
-            # 0.2% mistag rate for light-jets.
-            elif rand <= 0.002:
+            # b-tag decision for this jet, reused for the jet%dbtag branches.
+            jettag[x] = btaggedjet(
+                event.jetbhadron[x], event.jetchadron[x], random.random()
+            )
+            if jettag[x] == 1:
                 tracker_btj.append(x)
 
             # Remaining Jets must be tagged c-jets.
@@ -380,42 +378,11 @@ def augment_rootfile(filepath):
 
         # Chisquare.
         if btagjets >= 6:
-            for o in xrange(0, 6):
-                for j in xrange(1, 6):
-                    for k in xrange(2, 6):
-                        for l in xrange(3, 6):
-                            if o == j == k == l:
-                                continue
-                            if o > j > k > l:
-                                continue
-                            if j > k > l:
-                                continue
-                            if k > l:
-                                continue
-                            if o > j:
-                                continue
-                            if j > k:
-                                continue
-                            if o == j == k:
-                                continue
-                            if o == j:
-                                continue
-                            if o == k:
-                                continue
-                            if o == l:
-                                continue
-                            if j == k == l:
-                                continue
-                            if j == k:
-                                continue
-                            if j == l:
-                                continue
-                            if k == l:
-                                continue
-                            chisq.append(
-                                (vectorsum(o, j, "M") - 120000) ** 2
-                                + (vectorsum(k, l, "M") - 120000) ** 2
-                            )
+            for o, j, k, l in pairings:
+                chisq.append(
+                    (vectorsum(o, j, "M") - 120000) ** 2
+                    + (vectorsum(k, l, "M") - 120000) ** 2
+                )
         # Checking if chiaquare exist.
         if len(chisq) > 0:
             chi[0] = min(chisq)
@@ -463,7 +430,7 @@ def augment_rootfile(filepath):
             jetpT[n][0] = event.jetpT[n - 1]
             jeteta[n][0] = event.jeteta[n - 1]
             jetphi[n][0] = event.jetphi[n - 1]
-            jetbtag[n][0] = btaggedjet(event.jetbhadron[n - 1],event.jetchadron[n-1])
+            jetbtag[n][0] = jettag[n - 1]
 
         else:
 
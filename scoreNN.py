@@ -0,0 +1,205 @@
+# Written By : Jonathan O. Tellechea
+# Adviser    : Mike Hance, Phd
+# Research   : Using a neural network to maximize the significance of tttHH production.
+# Description: Scores flattened samples with a trained NN (.h5) and the scaler and branches saved with it. Every
+#              sample is read in chunks of events that are scaled and scored in a process pool, and written to a new file
+#              with one score per event next to truth and weights.
+###########################################################################################################################
+# Imported packages.
+import os, time, argparse
+import itertools
+import multiprocessing
+import numpy as np
+import slug
+import columnarFlatten
+
+# Columns of the output files.
+outputBranches = ["score", "truth", "weights"]
+
+# Model and scaler of a worker process, loaded once by loadWorker.
+worker = {}
+
+
+def loadWorker(modelFile, scaler, threads):
+    """
+    Loads the model in a worker process, tensorflow uses threads cores in each one.
+    """
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    worker["model"] = tf.keras.models.load_model(modelFile)
+    worker["scaler"] = scaler
+
+
+def sampleChunks(path, chunksize):
+    """
+    Chunks of a flattened sample: entry ranges of chunksize events for ROOT files, the row groups
+    (Parquet) or record batches (Feather) the file was written in.
+
+    Returns a list of (index, entrystart, entrystop).
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        meta = pq.ParquetFile(path).metadata
+        sizes = [meta.row_group(i).num_rows for i in range(meta.num_row_groups)]
+    elif path.endswith(".feather"):
+        import pyarrow as pa
+
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        sizes = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+    else:
+        import uproot
+
+        n_entries = uproot.open(path)[slug.tree].numentries
+        sizes = [min(chunksize, n_entries - start) for start in range(0, n_entries, chunksize)]
+    stops = np.cumsum(sizes, dtype=int)
+    return [(i, int(stop - size), int(stop)) for i, (size, stop) in enumerate(zip(sizes, stops))]
+
+
+def readChunk(path, branches, index, entrystart, entrystop):
+    """
+    Data frame of one chunk of a flattened sample (see sampleChunks).
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).read_row_group(index, columns=branches).to_pandas()
+    if path.endswith(".feather"):
+        import pyarrow as pa
+
+        batch = pa.ipc.open_file(pa.memory_map(path)).get_batch(index)
+        return batch.to_pandas()[branches]
+    import uproot
+
+    tree = uproot.open(path)[slug.tree]
+    return tree.pandas.df(branches, entrystart=entrystart, entrystop=entrystop)
+
+
+def scoreChunk(task):
+    """
+    Scores one chunk of a sample in a worker process.
+
+    task: (path, branches, index, entrystart, entrystop)
+
+    Returns the path and a dict of the output columns.
+    """
+    path, branches, index, entrystart, entrystop = task
+    df = readChunk(path, branches, index, entrystart, entrystop)
+    X = worker["scaler"].transform(df[branches[:-2]].values).astype(np.float32)
+    columns = {
+        "score": worker["model"].predict(X, batch_size=8192).ravel().astype(np.float32),
+        "truth": df["truth"].values.astype(np.float32),
+        "weights": df["weights"].values.astype(np.float32),
+    }
+    return path, columns
+
+
+def scoreFiles(
+    filepaths,
+    modelFile,
+    scaler,
+    branches,
+    chunksize=100000,
+    workers=None,
+    fmt="root",
+    compression=None,
+    outdir=None,
+):
+    """
+    Scores several flattened samples with a model and its fitted scaler.
+
+    All the chunks of all the files are scored in one process pool; every worker loads the model
+    once and only holds one chunk at a time. The chunks of a file are written in order to
+    score_<file>.<fmt> (in outdir, next to the input by default), see columnarFlatten.writeColumns.
+
+    Returns the list of output files.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    threads = max(1, os.cpu_count() // workers)
+
+    tasks = []
+    outputs = {}
+    for filepath in filepaths:
+        for index, entrystart, entrystop in sampleChunks(filepath, chunksize):
+            tasks.append((filepath, branches, index, entrystart, entrystop))
+        outname = "score_" + os.path.splitext(os.path.basename(filepath))[0] + "." + fmt
+        outputs[filepath] = os.path.join(outdir or os.path.dirname(filepath), outname)
+
+    n_entries = sum(task[4] - task[3] for task in tasks)
+    start_time = time.time()
+    processed = 0
+
+    def progress(results):
+        nonlocal processed
+        for path, columns in results:
+            processed += len(columns["score"])
+
+            # Show some progress
+            print(
+                "   scoring entry {:8d}/{:d} [{:5.0f} evts/s]".format(
+                    processed, n_entries, processed / (time.time() - start_time)
+                )
+            )
+            yield path, columns
+
+    written = []
+    with multiprocessing.Pool(workers, loadWorker, (modelFile, scaler, threads)) as pool:
+        results = progress(pool.imap(scoreChunk, tasks))
+        for path, chunks in itertools.groupby(results, key=lambda result: result[0]):
+            columns = (columns for path, columns in chunks)
+            written.append(
+                columnarFlatten.writeColumns(outputs[path], columns, outputBranches, fmt, compression)
+            )
+            print(outputs[path])
+    return written
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="score flattened samples with a trained NN")
+    parser.add_argument("--model", required=True, help="trained model, e.g. data/filename.h5")
+    parser.add_argument("--phase", type=int, default=3, choices=[1, 2, 3], help="feature set, models saved without preprocessing")
+    parser.add_argument("--numofjets", type=int, default=10, help="number of jets, models saved without preprocessing")
+    parser.add_argument("--scaler", default=None, help="saved scaler, instead of the preprocessing saved with the model")
+    parser.add_argument("--file", nargs="+", help="flattened samples, e.g. new_TTHH.root new_TTBB.root")
+    parser.add_argument("--chunksize", type=int, default=100000, help="events per chunk (ROOT files)")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument("--format", default="root", choices=["root", "parquet", "feather"], help="output format")
+    parser.add_argument(
+        "--compression",
+        default=None,
+        help="compression codec (%s)"
+        % ", ".join("%s: %s" % (fmt, "/".join(c)) for fmt, c in columnarFlatten.compressionCodecs.items()),
+    )
+    parser.add_argument("--outdir", default=None, help="output directory (default: next to each input)")
+    args = parser.parse_args()
+    codecs = columnarFlatten.compressionCodecs[args.format]
+    if args.compression is not None and args.compression not in codecs:
+        parser.error("--format %s takes --compression %s" % (args.format, "/".join(codecs)))
+
+    # Scaler and branches saved with the model, or the given scaler with dataCol(phase, numofjets).
+    if args.scaler:
+        import joblib
+
+        prep = {"scaler": joblib.load(args.scaler), "branches": slug.dataCol(args.phase, args.numofjets)}
+    else:
+        prep = slug.loadPreprocessing(args.model, args.phase, args.numofjets)
+    if prep["scaler"].n_features_in_ != len(prep["branches"]) - 2:
+        parser.error(
+            "the scaler was fitted on %d features, the branch list has %d"
+            % (prep["scaler"].n_features_in_, len(prep["branches"]) - 2)
+        )
+    scoreFiles(
+        args.file,
+        args.model,
+        prep["scaler"],
+        prep["branches"],
+        chunksize=args.chunksize,
+        workers=args.workers,
+        fmt=args.format,
+        compression=args.compression,
+        outdir=args.outdir,
+    )
@@ -6,14 +6,16 @@
 ###########################################################################################################################
 # Imported packages.
 #import tkinter as tk
+import os
+import sys
 import math
-import matplotlib
+import time
+import resource
+import contextlib
 import numpy as np
-import pandas as pd
-#matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-import joblib
+# matplotlib, pandas, sklearn, joblib and uproot are imported by the functions that use them, so
+# importing slug (e.g. for dataCol or getZPoisson) stays fast.
+
 # Fixed values.
 tree = "OutputTree"
 seed = 42
@@ -70,6 +72,23 @@ def dataCol(phase,numberofjets):
 
     return branches
 
+def readSample(path,branches):
+    '''
+    Reads the branches of a flattened sample into a pandas data frame.
+
+    The format is picked from the extension: ROOT (.root), Parquet (.parquet) or Feather (.feather).
+
+    '''
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=branches)
+    elif path.endswith('.feather'):
+        return pd.read_feather(path, columns=branches)
+    import uproot
+
+    return uproot.open(path)[tree].pandas.df(branches)
+
 def scaleData(data,phase):
     '''
     Scales data to have 0 mean with a variance of unity.
@@ -77,6 +96,9 @@ def scaleData(data,phase):
     Returns data scaled and saves stats as pxl to unscale data.
 
     '''
+    import joblib
+    from sklearn.preprocessing import StandardScaler
+
     scaler = StandardScaler()
     scaler.fit(data)
     sData = scaler.transform(data)
@@ -91,13 +113,78 @@ def loadScaledData(data,phase):
     Returns data and loads stats from pxl file.
 
     '''
+    import joblib
+
     scaler = joblib.load('phase' + str(phase) + '-Scaler.pxl')
     sData = scaler.transform(data)
     print('Loaded scaler and transformed data')
     return sData
 
 
+@contextlib.contextmanager
+def span(timings,name):
+    '''
+    Adds the wall time (seconds) spent in a with block to timings[name]:
+
+        with slug.span(timings,'fit'):
+            model.fit(...)
+
+    '''
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name,0.0) + time.perf_counter() - start
+
+def peakMemory():
+    '''
+    Peak resident memory (MB) of this process or of its largest finished child process.
+    '''
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (2**20 if sys.platform == 'darwin' else 2**10)
+
+def preprocessingFile(modelFile):
+    '''
+    Name of the preprocessing file saved next to a model: data/name.h5 -> data/name.prep.pxl
+    '''
+    return os.path.splitext(modelFile)[0] + '.prep.pxl'
+
+def savePreprocessing(modelFile,scaler,branches,phase,numberofjets):
+    '''
+    Saves what a model needs to score events next to it: the fitted scaler, the branch list,
+    the phase and the number of jets.
+
+    '''
+    import joblib
+
+    prep = {'scaler': scaler, 'branches': branches, 'phase': phase, 'numofjets': numberofjets}
+    joblib.dump(prep,preprocessingFile(modelFile))
+    print('Saved preprocessing!')
+
+def loadPreprocessing(modelFile,phase=None,numberofjets=10):
+    '''
+    Loads the preprocessing saved with a model (see savePreprocessing).
+
+    Models saved before it existed fall back to phaseN-Scaler.pxl and dataCol(phase,numberofjets)
+    when a phase is given, otherwise None is returned.
+
+    '''
+    import joblib
+
+    if os.path.exists(preprocessingFile(modelFile)):
+        return joblib.load(preprocessingFile(modelFile))
+    if phase is None:
+        return None
+    print('No preprocessing saved with',modelFile,'using phase' + str(phase) + '-Scaler.pxl')
+    scaler = joblib.load('phase' + str(phase) + '-Scaler.pxl')
+    return {'scaler': scaler, 'branches': dataCol(phase,numberofjets), 'phase': phase, 'numofjets': numberofjets}
+
+
 def plotPR(x, y, t):
+    import matplotlib.pyplot as plt
+
     plt.subplot(411)
     plt.plot(t, x[:-1], "b--", label="Precision")
     plt.plot(t, y[:-1], "g-", label="Recall")
@@ -109,6 +196,8 @@ def plotPR(x, y, t):
 
 
 def plotROC(x, y, AUC):
+    import matplotlib.pyplot as plt
+
     plt.subplot(412)
     plt.plot(x, y, lw=1, label="ROC (area = %0.6f)" % (AUC))
     plt.plot([0, 1], [0, 1], "--", color=(0.6, 0.6, 0.6), label="Luck")
@@ -120,7 +209,40 @@ def plotROC(x, y, AUC):
     plt.legend(loc="lower right")
     plt.grid()
 
+def batchBackend(batch):
+    '''
+    Batch jobs (no display) use the Agg backend: figures are only saved, never shown. Otherwise
+    matplotlib picks its default backend, an interactive one when there is a display.
+    '''
+    if batch:
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+
+def showFigures(batch, prefix):
+    '''
+    Shows the open figures, or in batch mode saves figure N to prefixN.png and closes them.
+
+    Returns the list of saved files.
+    '''
+    import matplotlib.pyplot as plt
+
+    if not batch:
+        plt.show()
+        return []
+    saved = []
+    for number in plt.get_fignums():
+        filename = "%s%d.png" % (prefix, number)
+        plt.figure(number).savefig(filename)
+        saved.append(filename)
+    plt.close("all")
+    return saved
+
 def confusedMatrix(Matrix):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     label = ['Signal','Background']
     df_CM = pd.DataFrame(Matrix, index=label, columns=label)
     sn.heatmap(df_CM,cmap='Blues',annot=True)
@@ -145,36 +267,125 @@ def getZPoisson(s, b, stat, syst):
     stat and syst terms.  e.g. the stat term above is really only
     characterizing the uncertainty due to limited MC statistics used
     to estimate the background yield.
+
+    All arguments can be numbers or arrays and are broadcast against each
+    other, e.g. s and b of a whole ROC with syst[:, None] gives one
+    significance curve per systematic. Returns a float for numbers.
     """
+    s, b, stat, syst = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (s, b, stat, syst))
+    )
     n = s + b
 
     # this is a relative uncertainty
-    sigma = math.sqrt(stat ** 2 + syst ** 2)
+    sigma = np.sqrt(stat ** 2 + syst ** 2)
 
     # turn into the total uncertainty
     sigma = sigma * b
 
-    if s <= 0 or b <= 0:
-        return 0
-
-    factor1 = 0
-    factor2 = 0
-
-    if sigma < 0.01:
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
         # In the limit where the total BG uncertainty is zero,
         # this reduces to approximately s/sqrt(b)
-        factor1 = n * math.log((n / b))
-        factor2 = n - b
-    else:
-        factor1 = n * math.log((n * (b + sigma ** 2)) / ((b ** 2) + n * sigma ** 2))
-        factor2 = ((b ** 2) / (sigma ** 2)) * math.log(
-            1 + ((sigma ** 2) * (n - b)) / (b * (b + sigma ** 2))
+        factor1 = np.where(
+            sigma < 0.01,
+            n * np.log((n / b)),
+            n * np.log((n * (b + sigma ** 2)) / ((b ** 2) + n * sigma ** 2)),
         )
+        factor2 = np.where(
+            sigma < 0.01,
+            n - b,
+            ((b ** 2) / (sigma ** 2))
+            * np.log(1 + ((sigma ** 2) * (n - b)) / (b * (b + sigma ** 2))),
+        )
+        signif = np.sqrt(2 * (factor1 - factor2))
 
-    signif = 0
-    try:
-        signif = math.sqrt(2 * (factor1 - factor2))
-    except ValueError:
-        signif = 0
+    # No signal/background or a negative argument of the sqrt.
+    signif = np.where((s <= 0) | (b <= 0) | ~np.isfinite(signif), 0.0, signif)
 
+    if signif.ndim == 0:
+        return float(signif)
     return signif
+
+
+def categoryHistograms(values, category, ncategories, edges, weights=None):
+    """
+    Weighted histograms of one feature for every category of events, filled with one bincount.
+
+    values: feature value of each event
+    category: category of each event (0 .. ncategories - 1), negative for events left out
+              (e.g. the sample of the events passing a score cut, -1 for the others)
+    edges: increasing bin edges; like np.histogram the last bin includes its right edge and
+           values outside the edges (or NaN) are not counted
+    weights: event weights, 1 per event if None
+
+    Returns an array (ncategories, len(edges) - 1), row k is the histogram of category k.
+    """
+    values = np.asarray(values)
+    category = np.asarray(category)
+    edges = np.asarray(edges, dtype=float)
+    nbins = len(edges) - 1
+
+    index = np.searchsorted(edges, values, side="right") - 1
+    index[values == edges[-1]] = nbins - 1
+    keep = (category >= 0) & (index >= 0) & (index < nbins)
+    flat = category[keep].astype(np.intp) * nbins + index[keep]
+    counts = np.bincount(
+        flat,
+        weights=None if weights is None else np.asarray(weights)[keep],
+        minlength=ncategories * nbins,
+    )
+    return counts.reshape(ncategories, nbins)
+
+
+def weightedYields(sigScore, bkgScore, sigWeights=None, bkgWeights=None):
+    """
+    Exact signal and background yields above every distinct score, from one sort of all the scores.
+
+    sigScore, bkgScore: NN scores of the signal and background events
+    sigWeights, bkgWeights: event weights (e.g. weights * scalefactor for the signal), 1 per event if None
+
+    Returns thresholds (decreasing), s and b: the weighted signal and background yields of the cut
+    score >= threshold. Memory is a few arrays the size of the number of events, no histogram bins.
+    """
+    nsig = len(sigScore)
+    scores = np.concatenate((np.ravel(sigScore), np.ravel(bkgScore)))
+    weights = np.ones(len(scores))
+    if sigWeights is not None:
+        weights[:nsig] = sigWeights
+    if bkgWeights is not None:
+        weights[nsig:] = bkgWeights
+
+    order = np.argsort(-scores, kind="stable")
+    scores = scores[order]
+    weights = weights[order]
+    signal = order < nsig
+    s = np.cumsum(np.where(signal, weights, 0.0))
+    b = np.cumsum(np.where(signal, 0.0, weights))
+
+    # Last event of every run of equal scores, the cut keeps the whole run.
+    last = np.append(scores[1:] != scores[:-1], True)
+    return scores[last], s[last], b[last]
+
+
+def maxSignificance(tp, fp, stat=0.0, syst=0.0, minbkg=10, *, thresholds):
+    """
+    Best cut of a significance scan.
+
+    tp: expected signal yield above each cut, from the highest cut down (see weightedYields)
+    fp: expected background yield above each cut, same order
+    stat, syst: relative uncertainties on the background, as in getZPoisson
+    minbkg: cuts with fewer background events are skipped
+    thresholds: score of each cut, same order
+
+    Returns score, maxsignif, maxs, maxb: the threshold of the cut, its significance and the signal
+    and background yields. The first cut reaching the maximum is kept; score is 0 if no cut passes
+    minbkg with a positive significance.
+    """
+    signif = getZPoisson(tp, fp, stat, syst)
+    signif[np.asarray(fp) < minbkg] = 0
+
+    best = int(np.argmax(signif))
+    if signif[best] <= 0:
+        return 0.0, 0.0, 0, 0
+    score = thresholds[best]
+    return score, signif[best], tp[best], fp[best]